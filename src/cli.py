@@ -3,6 +3,8 @@ Module CLI pour l'analyse EVM
 """
 
 import argparse
+import logging
+import sys
 from pathlib import Path
 
 from src.calculs import (
@@ -21,6 +23,8 @@ from src.evm_io import (
 )
 from src.visualisation import generer_rapport_word, tracer_courbe_projections, tracer_courbe_realise
 
+_NOM_HANDLER_CONSOLE = "evm-cli"
+
 
 def parser_arguments():
     """
@@ -162,12 +166,27 @@ def _cleanup_intermediate_files(files: list[str]) -> None:
             print(f"✓ {fichier} supprimé")
 
 
+def _configurer_journalisation() -> None:
+    """Affiche sur la console les messages des modules de visualisation, sans configurer le logger racine"""
+    log = logging.getLogger("src.visualisation")
+    # main() peut être appelée plusieurs fois dans un même processus : remplacer le handler plutôt que l'empiler
+    for handler in [h for h in log.handlers if h.get_name() == _NOM_HANDLER_CONSOLE]:
+        log.removeHandler(handler)
+    handler = logging.StreamHandler(sys.stdout)
+    handler.set_name(_NOM_HANDLER_CONSOLE)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(handler)
+    log.setLevel(logging.INFO)
+
+
 def main():
     """
     Fonction principale
     """
     args = parser_arguments()
 
+    _configurer_journalisation()
+
     _print_intro(args)
 
     # Lecture du fichier Excel
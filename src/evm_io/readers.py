@@ -4,6 +4,10 @@ Module de lecture des fichiers Excel pour l'analyse EVM
 
 import pandas as pd
 
+# Type explicite des libellés de jalons des fichiers PV, VA et forecast, sans inférence à la lecture ; les montants
+# restent inférés : un cast float64 forcé ferait échouer toute la lecture sur une seule cellule texte.
+_DTYPES_JALONS = {"Jalon": "string"}
+
 
 def lire_export_sap(fichier="EXPORT.XLSX"):
     """
@@ -27,7 +31,7 @@ def lire_planned_value(fichier="pv.xlsx"):
     Lit le fichier Excel contenant la Planned Value (PV)
     """
     try:
-        df_pv = pd.read_excel(fichier)
+        df_pv = pd.read_excel(fichier, dtype=_DTYPES_JALONS)
         print(f"\nFichier PV chargé avec succès: {len(df_pv)} lignes")
         print(f"Colonnes PV: {df_pv.columns.tolist()}")
         return df_pv
@@ -45,7 +49,7 @@ def lire_valeur_acquise(fichier="va.xlsx"):
     Lit le fichier Excel contenant les pourcentages d'avancement (Valeur Acquise)
     """
     try:
-        df_va = pd.read_excel(fichier)
+        df_va = pd.read_excel(fichier, dtype=_DTYPES_JALONS)
         print(f"\nFichier VA chargé avec succès: {len(df_va)} lignes")
         print(f"Colonnes VA: {df_va.columns.tolist()}")
         return df_va
@@ -63,7 +67,7 @@ def lire_forecast(fichier="forecast.xlsx"):
     Lit le fichier Excel contenant les projections (forecast)
     """
     try:
-        df_forecast = pd.read_excel(fichier)
+        df_forecast = pd.read_excel(fichier, dtype=_DTYPES_JALONS)
         print(f"\nFichier Forecast chargé avec succès: {len(df_forecast)} lignes")
         print(f"Colonnes Forecast: {df_forecast.columns.tolist()}")
         return df_forecast
@@ -2,110 +2,139 @@
 Module de génération de graphiques EVM
 """
 
-import matplotlib.pyplot as plt
+import logging
+from functools import cache
+
+import numpy as np
+
+_log = logging.getLogger(__name__)
 
 FIGSIZE = (16, 9)
+# Conversion € -> k€ par multiplication
+KE_SCALE = 1e-3
+DPI = 150
+PNG_PIL_KWARGS = {"compress_level": 3, "optimize": False}
+SUBPLOTS_ADJUST = {"left": 0.07, "right": 0.98, "top": 0.93, "bottom": 0.12}
 TEXTCOORDS_OFFSET_POINTS = "offset points"
 YLABEL_MONTANT_CUMULE_KE = "Montant cumulé (k€)"
 LEGEND_LOC_UPPER_LEFT = "upper left"
 BOXSTYLE_ROUND_PAD_03 = "round,pad=0.3"
 BOXSTYLE_ROUND_PAD_04 = "round,pad=0.4"
 
-
-def _new_figure() -> None:
-    plt.figure(figsize=FIGSIZE)
+# Styles des courbes, construits une seule fois et passés tels quels à ax.plot
+_AC_STYLE = {"marker": "o", "linewidth": 2.5, "markersize": 8, "color": "#e74c3c", "linestyle": "-", "zorder": 3}
+_PV_STYLE = {"marker": "s", "linewidth": 2.5, "markersize": 8, "color": "#3498db", "linestyle": "--", "zorder": 2}
+_EV_STYLE = {"marker": "^", "linewidth": 2.5, "markersize": 8, "color": "#2ecc71", "linestyle": "-.", "zorder": 2}
+_EAC_STYLE = {
+    "marker": "*",
+    "linewidth": 2.5,
+    "markersize": 10,
+    "color": "#f39c12",
+    "linestyle": "--",
+    "zorder": 2,
+    "alpha": 0.8,
+}
+_CV_STYLE = {
+    "marker": "d",
+    "linewidth": 2,
+    "markersize": 6,
+    "color": "#e67e22",
+    "linestyle": ":",
+    "zorder": 1,
+    "alpha": 0.7,
+}
+_SV_STYLE = {
+    "marker": "v",
+    "linewidth": 2,
+    "markersize": 6,
+    "color": "#9b59b6",
+    "linestyle": ":",
+    "zorder": 1,
+    "alpha": 0.7,
+}
+_PROJECTION_STYLE = {"marker": "*", "linewidth": 2.5, "markersize": 8, "linestyle": "--", "zorder": 2, "alpha": 0.8}
+
+
+@cache
+def _plt():
+    """Importe pyplot à la première utilisation, pour ne pas pénaliser le démarrage de la CLI"""
+    import matplotlib as mpl  # noqa: PLC0415
+
+    # Aucun graphique n'est affiché : le backend Agg évite l'initialisation d'une interface graphique
+    mpl.use("Agg")
+    # Simplification et découpage des tracés longs pour accélérer la rastérisation Agg
+    mpl.rcParams["path.simplify"] = True
+    mpl.rcParams["path.simplify_threshold"] = 1.0
+    mpl.rcParams["agg.path.chunksize"] = 10000
+
+    import matplotlib.pyplot as plt  # noqa: PLC0415
+
+    return plt
+
+
+def _index_to_ts(index, dates_par_index: dict | None = None) -> np.ndarray:
+    """Convertit un PeriodIndex en dates datetime64, une seule fois par index au sein d'un même graphique"""
+    if dates_par_index is None:
+        return index.to_timestamp().to_numpy()
+    cached = dates_par_index.get(id(index))
+    # L'index est conservé avec ses dates : son id ne peut pas être réattribué pendant le tracé
+    if cached is None or cached[0] is not index:
+        cached = dates_par_index[id(index)] = (index, index.to_timestamp().to_numpy())
+    return cached[1]
+
+
+def _new_figure():
+    return _plt().subplots(figsize=FIGSIZE)
 
 
 def _bbox(boxstyle: str, edgecolor: str, alpha: float = 0.8) -> dict:
     return {"boxstyle": boxstyle, "facecolor": "white", "edgecolor": edgecolor, "alpha": alpha}
 
 
-def _plot_series(
-    dates, values, *, marker: str, label: str, color: str, linestyle: str = "-", zorder: int = 2, alpha: float = 1.0
-) -> None:
-    plt.plot(
-        dates,
-        values,
-        marker=marker,
-        linewidth=2.5,
-        markersize=8,
-        label=label,
-        color=color,
-        linestyle=linestyle,
-        zorder=zorder,
-        alpha=alpha,
-    )
-
-
-def _plot_ac(depenses_cumulees):
-    depenses_ke = depenses_cumulees / 1000
-    dates_depenses = [periode.to_timestamp() for periode in depenses_cumulees.index]
-    _plot_series(
-        dates_depenses,
-        depenses_ke.values,
-        marker="o",
-        label="AC (Actual Cost - Dépenses réelles)",
-        color="#e74c3c",
-        zorder=3,
-    )
+def _plot_ac(ax, depenses_cumulees, *, dates_par_index=None):
+    depenses_ke = depenses_cumulees.to_numpy() * KE_SCALE
+    dates_depenses = _index_to_ts(depenses_cumulees.index, dates_par_index)
+    ax.plot(dates_depenses, depenses_ke, label="AC (Actual Cost - Dépenses réelles)", **_AC_STYLE)
     return depenses_ke, dates_depenses
 
 
-def _plot_pv(pv_cumulee, jalons=None) -> None:
-    pv_ke = pv_cumulee / 1000
-    dates_pv = [periode.to_timestamp() for periode in pv_cumulee.index]
-    _plot_series(
-        dates_pv,
-        pv_ke.values,
-        marker="s",
-        label="PV (Planned Value - Budget prévu)",
-        color="#3498db",
-        linestyle="--",
-        zorder=2,
-    )
+def _plot_pv(ax, pv_cumulee, jalons=None, *, dates_par_index=None) -> None:
+    pv_ke = pv_cumulee.to_numpy() * KE_SCALE
+    dates_pv = _index_to_ts(pv_cumulee.index, dates_par_index)
+    ax.plot(dates_pv, pv_ke, label="PV (Planned Value - Budget prévu)", **_PV_STYLE)
     if jalons:
-        _annotate_jalons(jalons, pv_cumulee.index, pv_ke.values, color="#3498db", xytext=(10, -15))
-
-
-def _plot_ev(ev_cumulee, *, label: str = "EV (Earned Value - Valeur acquise)") -> None:
-    ev_ke = ev_cumulee / 1000
-    dates_ev = [periode.to_timestamp() for periode in ev_cumulee.index]
-    _plot_series(
-        dates_ev,
-        ev_ke.values,
-        marker="^",
-        label=label,
-        color="#2ecc71",
-        linestyle="-.",
-        zorder=2,
-    )
+        _annotate_jalons(
+            ax,
+            jalons,
+            pv_cumulee.index,
+            pv_ke,
+            color=_PV_STYLE["color"],
+            xytext=(10, -15),
+            dates_par_index=dates_par_index,
+        )
 
 
-def _plot_eac_projete(eac_projete, jalons_forecast=None) -> None:
-    eac_ke = eac_projete / 1000
-    dates_eac = [periode.to_timestamp() for periode in eac_projete.index]
-    plt.plot(
-        dates_eac,
-        eac_ke.values,
-        marker="*",
-        linewidth=2.5,
-        markersize=10,
-        label="EAC (Estimate at Completion - Projection)",
-        color="#f39c12",
-        linestyle="--",
-        zorder=2,
-        alpha=0.8,
-    )
+def _plot_ev(ax, ev_cumulee, *, label: str = "EV (Earned Value - Valeur acquise)", dates_par_index=None) -> None:
+    ev_ke = ev_cumulee.to_numpy() * KE_SCALE
+    dates_ev = _index_to_ts(ev_cumulee.index, dates_par_index)
+    ax.plot(dates_ev, ev_ke, label=label, **_EV_STYLE)
+
+
+def _plot_eac_projete(ax, eac_projete, jalons_forecast=None, *, dates_par_index=None) -> None:
+    eac_ke = eac_projete.to_numpy() * KE_SCALE
+    dates_eac = _index_to_ts(eac_projete.index, dates_par_index)
+    ax.plot(dates_eac, eac_ke, label="EAC (Estimate at Completion - Projection)", **_EAC_STYLE)
 
     if not jalons_forecast:
         return
 
+    points_par_mois = dict(zip(eac_projete.index, zip(dates_eac, eac_ke)))
     for jalon, info in jalons_forecast.items():
         mois = info["date"]
-        if mois in eac_projete.index:
-            date = mois.to_timestamp()
-            valeur = eac_projete[mois] / 1000
+        if mois in points_par_mois:
+            date, valeur = points_par_mois[mois]
             _annotate(
+                ax,
                 jalon,
                 xy=(date, valeur),
                 xytext=(10, 10),
@@ -115,23 +144,32 @@ def _plot_eac_projete(eac_projete, jalons_forecast=None) -> None:
             )
 
 
-def _annotate_key_points(dates, values, *, step_divisor: int = 6, color: str = "#e74c3c") -> None:
-    step = max(1, len(dates) // step_divisor)
-    for i, (date, valeur) in enumerate(zip(dates, values)):
-        if i % step == 0 or i == len(dates) - 1:
-            plt.annotate(
-                f"{valeur:.0f}",
-                xy=(date, valeur),
-                xytext=(0, 10),
-                textcoords=TEXTCOORDS_OFFSET_POINTS,
-                ha="center",
-                fontsize=7,
-                color=color,
-            )
+def _annotate_key_points(ax, dates, values, *, step_divisor: int = 6, color: str = "#e74c3c") -> None:
+    n = len(dates)
+    if n == 0:
+        return
+    step = max(1, n // step_divisor)
+    # Un point sur `step` plus le dernier, sans parcourir toute la série
+    indices = np.unique(np.append(np.arange(0, n, step), n - 1))
+    # Simple texte décalé de 10 points vers le haut : ax.text suffit, sans la mécanique d'annotate
+    from matplotlib.transforms import offset_copy  # noqa: PLC0415
+
+    transform = offset_copy(ax.transData, fig=ax.figure, y=10, units="points")
+    for i in indices:
+        ax.text(
+            dates[i],
+            values[i],
+            f"{values[i]:.0f}",
+            transform=transform,
+            ha="center",
+            va="baseline",
+            fontsize=7,
+            color=color,
+        )
 
 
-def _annotate(text: str, *, xy, xytext, color: str, fontsize: int, boxstyle: str, ha: str = "left") -> None:
-    plt.annotate(
+def _annotate(ax, text: str, *, xy, xytext, color: str, fontsize: int, boxstyle: str, ha: str = "left") -> None:
+    ax.annotate(
         text,
         xy=xy,
         xytext=xytext,
@@ -143,39 +181,41 @@ def _annotate(text: str, *, xy, xytext, color: str, fontsize: int, boxstyle: str
     )
 
 
-def _annotate_jalons(jalons: dict, periodes, valeurs, *, color: str, xytext=(10, -15)) -> None:
-    for periode, valeur in zip(periodes, valeurs):
-        if periode in jalons:
-            date = periode.to_timestamp()
-            _annotate(
-                "\n".join(jalons[periode]),
-                xy=(date, valeur),
-                xytext=xytext,
-                color=color,
-                fontsize=8,
-                boxstyle=BOXSTYLE_ROUND_PAD_03,
-            )
+def _annotate_jalons(
+    ax, jalons: dict, periodes, valeurs, *, color: str, xytext=(10, -15), dates_par_index=None
+) -> None:
+    mask = periodes.isin(list(jalons.keys()))
+    if not mask.any():
+        return
+    dates = _index_to_ts(periodes, dates_par_index)[mask]
+    for periode, date, valeur in zip(periodes[mask], dates, np.asarray(valeurs)[mask]):
+        _annotate(
+            ax,
+            "\n".join(jalons[periode]),
+            xy=(date, valeur),
+            xytext=xytext,
+            color=color,
+            fontsize=8,
+            boxstyle=BOXSTYLE_ROUND_PAD_03,
+        )
+
+
+def _common_index(a, b):
+    # Cas courant : séries mensuelles sur le même index, pas besoin de calculer l'intersection
+    return a if a.equals(b) else a.intersection(b)
 
 
-def _plot_variance(depenses_cumulees, pv_cumulee, ev_cumulee) -> None:
-    mois_communs_cv = depenses_cumulees.index.intersection(ev_cumulee.index)
+def _plot_variance(ax, depenses_cumulees, pv_cumulee, ev_cumulee, *, dates_par_index=None) -> None:
+    mois_communs_cv = _common_index(depenses_cumulees.index, ev_cumulee.index)
     if len(mois_communs_cv) > 0:
-        cv_values = [(ev_cumulee[mois] - depenses_cumulees[mois]) / 1000 for mois in mois_communs_cv]
-        cv_dates = [mois.to_timestamp() for mois in mois_communs_cv]
-        plt.plot(
-            cv_dates,
-            cv_values,
-            marker="d",
-            linewidth=2,
-            markersize=6,
-            label="CV (Cost Variance = EV - AC)",
-            color="#e67e22",
-            linestyle=":",
-            zorder=1,
-            alpha=0.7,
-        )
+        cv_values = (
+            ev_cumulee.reindex(mois_communs_cv).to_numpy() - depenses_cumulees.reindex(mois_communs_cv).to_numpy()
+        ) * KE_SCALE
+        cv_dates = _index_to_ts(mois_communs_cv, dates_par_index)
+        ax.plot(cv_dates, cv_values, label="CV (Cost Variance = EV - AC)", **_CV_STYLE)
         if len(cv_dates) > 0:
             _annotate(
+                ax,
                 f"CV: {cv_values[-1]:.1f} k€",
                 xy=(cv_dates[-1], cv_values[-1]),
                 xytext=(10, 10),
@@ -184,24 +224,16 @@ def _plot_variance(depenses_cumulees, pv_cumulee, ev_cumulee) -> None:
                 boxstyle=BOXSTYLE_ROUND_PAD_04,
             )
 
-    mois_communs_sv = ev_cumulee.index.intersection(pv_cumulee.index)
+    mois_communs_sv = _common_index(ev_cumulee.index, pv_cumulee.index)
     if len(mois_communs_sv) > 0:
-        sv_values = [(ev_cumulee[mois] - pv_cumulee[mois]) / 1000 for mois in mois_communs_sv]
-        sv_dates = [mois.to_timestamp() for mois in mois_communs_sv]
-        plt.plot(
-            sv_dates,
-            sv_values,
-            marker="v",
-            linewidth=2,
-            markersize=6,
-            label="SV (Schedule Variance = EV - PV)",
-            color="#9b59b6",
-            linestyle=":",
-            zorder=1,
-            alpha=0.7,
-        )
+        sv_values = (
+            ev_cumulee.reindex(mois_communs_sv).to_numpy() - pv_cumulee.reindex(mois_communs_sv).to_numpy()
+        ) * KE_SCALE
+        sv_dates = _index_to_ts(mois_communs_sv, dates_par_index)
+        ax.plot(sv_dates, sv_values, label="SV (Schedule Variance = EV - PV)", **_SV_STYLE)
         if len(sv_dates) > 0:
             _annotate(
+                ax,
                 f"SV: {sv_values[-1]:.1f} k€",
                 xy=(sv_dates[-1], sv_values[-1]),
                 xytext=(10, -20),
@@ -211,17 +243,18 @@ def _plot_variance(depenses_cumulees, pv_cumulee, ev_cumulee) -> None:
             )
 
 
-def _finalize_plot(*, title: str, fichier_sortie: str, print_msg: str) -> None:
-    plt.xlabel("Mois", fontsize=12)
-    plt.ylabel(YLABEL_MONTANT_CUMULE_KE, fontsize=12)
-    plt.title(title, fontsize=14, fontweight="bold")
-    plt.grid(True, alpha=0.3)
-    plt.legend(loc=LEGEND_LOC_UPPER_LEFT, fontsize=9)
-    plt.gcf().autofmt_xdate()
-    plt.tight_layout()
-    plt.savefig(fichier_sortie, dpi=300, bbox_inches="tight")
-    plt.close(plt.gcf())
-    print(print_msg)
+def _finalize_plot(fig, ax, *, title: str, fichier_sortie: str, print_msg: str, dpi: int = DPI) -> None:
+    ax.set_xlabel("Mois", fontsize=12)
+    ax.set_ylabel(YLABEL_MONTANT_CUMULE_KE, fontsize=12)
+    ax.set_title(title, fontsize=14, fontweight="bold")
+    ax.grid(True, alpha=0.3)
+    ax.legend(loc=LEGEND_LOC_UPPER_LEFT, fontsize=9)
+    fig.autofmt_xdate()
+    # Marges fixes adaptées à FIGSIZE : évite les passes de mesure de tight_layout()/bbox_inches="tight"
+    fig.subplots_adjust(**SUBPLOTS_ADJUST)
+    fig.savefig(fichier_sortie, dpi=dpi, pil_kwargs=PNG_PIL_KWARGS)
+    _plt().close(fig)
+    _log.info(print_msg)
 
 
 def tracer_courbe(
@@ -236,29 +269,33 @@ def tracer_courbe(
     """
     Trace la courbe des dépenses cumulées, de la Planned Value et de l'Earned Value
     """
-    _new_figure()
+    fig, ax = _new_figure()
+    # Conversions PeriodIndex -> dates partagées entre les courbes de ce graphique
+    dates_par_index = {}
 
-    depenses_ke, dates_depenses = _plot_ac(depenses_cumulees)
+    depenses_ke, dates_depenses = _plot_ac(ax, depenses_cumulees, dates_par_index=dates_par_index)
 
     # Tracé de la Planned Value si disponible
     if pv_cumulee is not None:
-        _plot_pv(pv_cumulee, jalons)
+        _plot_pv(ax, pv_cumulee, jalons, dates_par_index=dates_par_index)
 
     # Tracé de l'Earned Value si disponible
     if ev_cumulee is not None:
-        _plot_ev(ev_cumulee)
+        _plot_ev(ax, ev_cumulee, dates_par_index=dates_par_index)
 
     # Tracé de l'EAC projeté si disponible
     if eac_projete is not None:
-        _plot_eac_projete(eac_projete, jalons_forecast)
+        _plot_eac_projete(ax, eac_projete, jalons_forecast, dates_par_index=dates_par_index)
 
     # Calcul et tracé de CV (Cost Variance) et SV (Schedule Variance)
     if ev_cumulee is not None and pv_cumulee is not None:
-        _plot_variance(depenses_cumulees, pv_cumulee, ev_cumulee)
+        _plot_variance(ax, depenses_cumulees, pv_cumulee, ev_cumulee, dates_par_index=dates_par_index)
 
-    _annotate_key_points(dates_depenses, depenses_ke.values, color="#e74c3c")
+    _annotate_key_points(ax, dates_depenses, depenses_ke, color="#e74c3c")
 
     _finalize_plot(
+        fig,
+        ax,
         title="Analyse EVM - AC vs PV vs EV",
         fichier_sortie=fichier_sortie,
         print_msg=f"Graphique sauvegardé: {fichier_sortie}",
@@ -271,39 +308,30 @@ def tracer_courbe_realise(
     """
     Trace le graphique du réalisé à date: AC, PV, EV avec CV et SV
     """
-    _new_figure()
+    fig, ax = _new_figure()
+    # Conversions PeriodIndex -> dates partagées entre les courbes de ce graphique
+    dates_par_index = {}
 
-    depenses_ke, dates_depenses = _plot_ac(depenses_cumulees)
+    depenses_ke, dates_depenses = _plot_ac(ax, depenses_cumulees, dates_par_index=dates_par_index)
 
     # Tracé de la Planned Value si disponible
     if pv_cumulee is not None:
-        _plot_pv(pv_cumulee)
-
         # Ajout des jalons sur la courbe PV
-        if jalons:
-            pv_ke = pv_cumulee / 1000
-            _annotate_jalons(jalons, pv_cumulee.index, pv_ke.values, color="#3498db", xytext=(10, -15))
+        _plot_pv(ax, pv_cumulee, jalons, dates_par_index=dates_par_index)
 
     # Tracé de l'Earned Value si disponible
     if ev_cumulee is not None:
-        _plot_ev(ev_cumulee)
+        _plot_ev(ax, ev_cumulee, dates_par_index=dates_par_index)
 
     # Calcul et tracé de CV (Cost Variance) et SV (Schedule Variance)
     if ev_cumulee is not None and pv_cumulee is not None:
-        _plot_variance(depenses_cumulees, pv_cumulee, ev_cumulee)
+        _plot_variance(ax, depenses_cumulees, pv_cumulee, ev_cumulee, dates_par_index=dates_par_index)
 
-    plt.xlabel("Mois", fontsize=12)
-    plt.ylabel("Montant cumulé (k€)", fontsize=12)
-    plt.title("Analyse EVM - Réalisé à date (AC vs PV vs EV)", fontsize=14, fontweight="bold")
-    plt.grid(True, alpha=0.3)
-    plt.legend(loc="upper left", fontsize=9)
-
-    # Format des dates sur l'axe x
-    plt.gcf().autofmt_xdate()
-
-    _annotate_key_points(dates_depenses, depenses_ke.values, color="#e74c3c")
+    _annotate_key_points(ax, dates_depenses, depenses_ke, color="#e74c3c")
 
     _finalize_plot(
+        fig,
+        ax,
         title="Analyse EVM - Réalisé à date (AC vs PV vs EV)",
         fichier_sortie=fichier_sortie,
         print_msg=f"✓ Graphique du réalisé sauvegardé: {fichier_sortie}",
@@ -321,41 +349,24 @@ def tracer_courbe_projections(depenses_cumulees, ev_cumulee, projections, fichie
                     {'cpi': {series, eac, date}, 'cpi_spi': {...}, 'reste_plan': {...}, 'forecast': {...}}
         fichier_sortie: Nom du fichier de sortie
     """
-    _new_figure()
+    fig, ax = _new_figure()
+    # Conversions PeriodIndex -> dates partagées entre les courbes de ce graphique
+    dates_par_index = {}
 
     # Conversion en k€ pour une meilleure lisibilité
-    depenses_ke = depenses_cumulees / 1000
+    depenses_ke = depenses_cumulees.to_numpy() * KE_SCALE
 
     # Conversion des périodes en dates pour l'affichage
-    dates_depenses = [periode.to_timestamp() for periode in depenses_cumulees.index]
+    dates_depenses = _index_to_ts(depenses_cumulees.index, dates_par_index)
 
     # Tracé de l'historique AC
-    plt.plot(
-        dates_depenses,
-        depenses_ke.values,
-        marker="o",
-        linewidth=2.5,
-        markersize=8,
-        label="AC historique (Dépenses réelles)",
-        color="#e74c3c",
-        zorder=3,
-    )
+    ax.plot(dates_depenses, depenses_ke, label="AC historique (Dépenses réelles)", **_AC_STYLE)
 
     # Tracé de l'EV si disponible
     if ev_cumulee is not None:
-        ev_ke = ev_cumulee / 1000
-        dates_ev = [periode.to_timestamp() for periode in ev_cumulee.index]
-        plt.plot(
-            dates_ev,
-            ev_ke.values,
-            marker="^",
-            linewidth=2.5,
-            markersize=8,
-            label="EV historique (Valeur acquise)",
-            color="#2ecc71",
-            linestyle="-.",
-            zorder=2,
-        )
+        ev_ke = ev_cumulee.to_numpy() * KE_SCALE
+        dates_ev = _index_to_ts(ev_cumulee.index, dates_par_index)
+        ax.plot(dates_ev, ev_ke, label="EV historique (Valeur acquise)", **_EV_STYLE)
 
     # Couleurs et styles pour les projections
     couleurs = {"cpi": "#f39c12", "cpi_spi": "#9b59b6", "reste_plan": "#e67e22", "forecast": "#3498db"}
@@ -367,40 +378,44 @@ def tracer_courbe_projections(depenses_cumulees, ev_cumulee, projections, fichie
         "forecast": "EAC forecast manuel",
     }
 
+    # Conversion unique de chaque projection : (dates, valeurs en k€, EAC en k€, date de fin)
+    projections_preparees = {
+        methode: (
+            _index_to_ts(projections[methode]["series"].index, dates_par_index),
+            projections[methode]["series"].to_numpy() * KE_SCALE,
+            projections[methode]["eac"] * KE_SCALE,
+            projections[methode]["date"],
+        )
+        for methode in couleurs
+        if projections.get(methode) is not None
+    }
+
     # Tracé de chaque projection
-    for methode, couleur in couleurs.items():
-        if methode in projections and projections[methode] is not None:
-            proj_data = projections[methode]
-            series = proj_data["series"] / 1000
-            dates_proj = [periode.to_timestamp() for periode in series.index]
-            eac_final = proj_data["eac"] / 1000
-            date_fin = proj_data["date"]
-
-            plt.plot(
-                dates_proj,
-                series.values,
-                marker="*",
-                linewidth=2.5,
-                markersize=8,
-                label=f"{labels_proj[methode]} ({eac_final:.0f} k€)",
+    for methode, (dates_proj, valeurs_ke, eac_final, date_fin) in projections_preparees.items():
+        couleur = couleurs[methode]
+        ax.plot(
+            dates_proj,
+            valeurs_ke,
+            label=f"{labels_proj[methode]} ({eac_final:.0f} k€)",
+            color=couleur,
+            **_PROJECTION_STYLE,
+        )
+
+        # Ajouter annotation sur le point final
+        if len(dates_proj) > 0:
+            _annotate(
+                ax,
+                f"{eac_final:.0f} k€\n{date_fin.strftime('%m/%Y')}",
+                xy=(dates_proj[-1], valeurs_ke[-1]),
+                xytext=(10, 10),
                 color=couleur,
-                linestyle="--",
-                zorder=2,
-                alpha=0.8,
+                fontsize=8,
+                boxstyle=BOXSTYLE_ROUND_PAD_03,
             )
 
-            # Ajouter annotation sur le point final
-            if len(dates_proj) > 0:
-                _annotate(
-                    f"{eac_final:.0f} k€\n{date_fin.strftime('%m/%Y')}",
-                    xy=(dates_proj[-1], series.to_numpy()[-1]),
-                    xytext=(10, 10),
-                    color=couleur,
-                    fontsize=8,
-                    boxstyle=BOXSTYLE_ROUND_PAD_03,
-                )
-
     _finalize_plot(
+        fig,
+        ax,
         title="Analyse EVM - Projections à terminaison (scénarios EAC)",
         fichier_sortie=fichier_sortie,
         print_msg=f"✓ Graphique des projections sauvegardé: {fichier_sortie}",
@@ -2,14 +2,22 @@
 Module de génération de rapports Word
 """
 
+import io
+from copy import deepcopy
 from datetime import datetime
+from functools import cache
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 from docx import Document
 from docx.document import Document as DocumentType
 from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
 from docx.shared import Inches, RGBColor
+from docx.styles.style import ParagraphStyle
+from lxml.etree import SubElement
 
 LIST_BULLET_STYLE = "List Bullet"
 LIST_NUMBER_STYLE = "List Number"
@@ -23,6 +31,53 @@ COL_VAC = "VAC (€)"
 COLOR_RED = RGBColor(231, 76, 60)
 COLOR_GREEN = RGBColor(46, 204, 113)
 
+# Types de scénarios (dans l'ordre d'affichage) et mots-clés reconnus dans leur libellé
+SCENARIO_KEYWORDS = (
+    ("Optimiste", ("Optimiste",)),
+    ("Réaliste", ("Réaliste",)),
+    ("Pessimiste", ("Pessimiste",)),
+    ("Forecast", ("Forecast", "Manuel")),
+)
+
+# Messages par tranche : (seuil exclusif, message), le premier seuil dépassant la valeur l'emporte.
+# Les messages d'interprétation sont complétés avec les chaînes de _compute_current_metrics.
+_INF = float("inf")
+_CV_MESSAGES = (
+    (0, "⚠ Le projet présente un dépassement de coût de {abs_cv_str} € à date."),
+    (_INF, "✓ Le projet est sous budget avec une économie de {cv_str} € à date."),
+)
+_SV_MESSAGES = (
+    (0, "⚠ Le projet présente un retard équivalent à {abs_sv_str} € de travail non réalisé."),
+    (_INF, "✓ Le projet est en avance avec {sv_str} € de travail supplémentaire réalisé."),
+)
+_CPI_INTERPRETATION_MESSAGES = (
+    (1, "⚠ L'efficacité des coûts est de {cpi_pct_str}% (chaque euro dépensé génère {cpi_str} € de valeur)."),
+    (_INF, "✓ L'efficacité des coûts est de {cpi_pct_str}% (chaque euro dépensé génère {cpi_str} € de valeur)."),
+)
+_CPI_MESSAGES = (
+    (
+        0.9,
+        "⚠ Le CPI est très faible, indiquant une efficacité des coûts préoccupante. Actions correctives urgentes recommandées.",
+    ),
+    (1, "⚠ Le CPI est inférieur à 1, indiquant un dépassement de coût. Une surveillance étroite est nécessaire."),
+    (_INF, "✓ Le CPI est supérieur à 1, indiquant une bonne efficacité des coûts."),
+)
+_SPI_MESSAGES = (
+    (0.9, "⚠ Le SPI est très faible, indiquant un retard significatif. Révision du planning recommandée."),
+    (1, "⚠ Le SPI est inférieur à 1, indiquant un retard. Des mesures d'accélération devraient être envisagées."),
+    (_INF, "✓ Le SPI est supérieur à 1, indiquant une bonne performance sur les délais."),
+)
+
+# Formats résolus une seule fois : montant (séparateur de milliers, 2 décimales) et ligne d'écart par scénario
+_format_montant = "{:,.2f}".format
+_format_ecart = "  • {label}: {signe}{ecart:,.2f} € ({pct:+.1f}%)".format
+
+# Propriétés de run préconstruites, copiées dans les runs au lieu de passer par run.font
+_BOLD_RPR = parse_xml(f"<w:rPr {nsdecls('w')}><w:b/></w:rPr>")
+_COLOR_RPR = {
+    color: parse_xml(f'<w:rPr {nsdecls("w")}><w:color w:val="{color}"/></w:rPr>') for color in (COLOR_RED, COLOR_GREEN)
+}
+
 
 def _add_centered_paragraph(doc: DocumentType, text: str):
     p = doc.add_paragraph(text)
@@ -38,7 +93,66 @@ def _add_title_page(doc: DocumentType) -> None:
     doc.add_page_break()
 
 
+def _insert_in_body(doc: DocumentType, element) -> None:
+    # Insertion avant le sectPr final, comme le ferait add_paragraph()
+    body = doc.element.body
+    sect_pr = body.sectPr
+    if sect_pr is None:
+        body.append(element)
+    else:
+        sect_pr.addprevious(element)
+
+
+def _append_cached_xml(doc: DocumentType, elements: tuple) -> None:
+    for element in elements:
+        _insert_in_body(doc, deepcopy(element))
+
+
+def _add_list_paragraph(doc: DocumentType, text: str, style: ParagraphStyle, rpr=None) -> None:
+    _add_paragraph_xml(doc, text, style.style_id, rpr)
+
+
+def _add_heading(doc: DocumentType, text: str, level: int) -> None:
+    _add_paragraph_xml(doc, text, _heading_style_id(level))
+
+
+@cache
+def _heading_style_id(level: int) -> str:
+    # Tous les rapports partent du modèle par défaut : l'identifiant du style est le même d'un document à l'autre
+    return Document().styles[f"Heading {level}"].style_id
+
+
+def _add_paragraph_xml(doc: DocumentType, text: str, style_id: str, rpr=None) -> None:
+    # Équivalent de doc.add_paragraph(text, style=...), construit directement en lxml
+    p = doc.element.body.makeelement(qn("w:p"), {})
+    SubElement(SubElement(p, qn("w:pPr")), qn("w:pStyle")).set(qn("w:val"), style_id)
+    r = SubElement(p, qn("w:r"))
+    if rpr is not None:
+        r.append(deepcopy(rpr))
+    t = SubElement(r, qn("w:t"))
+    t.set(qn("xml:space"), "preserve")
+    t.text = text
+    _insert_in_body(doc, p)
+
+
+def _body_xml(doc: DocumentType) -> tuple:
+    return tuple(element for element in doc.element.body if element.tag != qn("w:sectPr"))
+
+
 def _add_definitions_section(doc: DocumentType) -> None:
+    _append_cached_xml(doc, _definitions_xml())
+    doc.add_page_break()
+
+
+@cache
+def _definitions_xml() -> tuple:
+    # Section identique d'un rapport à l'autre : construite une fois dans un document modèle
+    modele = Document()
+    _write_definitions(modele, bullet_style=modele.styles[LIST_BULLET_STYLE])
+    return _body_xml(modele)
+
+
+def _write_definitions(doc: DocumentType, *, bullet_style: ParagraphStyle) -> None:
     doc.add_heading("1. Définitions EVM", 1)
 
     definitions = [
@@ -71,68 +185,102 @@ def _add_definitions_section(doc: DocumentType) -> None:
     ]
 
     for terme, definition in definitions:
-        p = doc.add_paragraph(style=LIST_BULLET_STYLE)
+        p = doc.add_paragraph(style=bullet_style)
         run_terme = p.add_run(terme + ": ")
         run_terme.bold = True
         p.add_run(definition)
 
-    doc.add_page_break()
-
 
 def _filter_df_tableau(df_tableau: pd.DataFrame) -> pd.DataFrame:
-    conditions = [df_tableau[COL_AC] > 0]
-    if COL_PV in df_tableau.columns:
-        conditions.append(df_tableau[COL_PV] > 0)
-    if COL_EV in df_tableau.columns:
-        conditions.append(df_tableau[COL_EV] > 0)
+    masks = [df_tableau[col].to_numpy() > 0 for col in (COL_AC, COL_PV, COL_EV) if col in df_tableau.columns]
+    # Un seul masque numpy, sans Series intermédiaires ni alignement d'index
+    combined = np.logical_or.reduce(masks)
+    # Sélection en lecture seule : le tableau filtré est seulement parcouru, pas besoin de copie
+    return df_tableau.iloc[combined]
+
+
+def _bucket(valeur: float, messages: tuple[tuple[float, str], ...]) -> str:
+    for seuil, message in messages:
+        if valeur < seuil:
+            return message
+    # NaN ne passe aucun seuil : même repli que la branche else d'origine
+    return messages[-1][1]
+
+
+def _fast_cell_text(tc, text: str, rpr=None) -> None:
+    # Équivalent de cell.text = text (+ mise en forme du run), construit directement en lxml
+    for p in tc.findall(qn("w:p")):
+        tc.remove(p)
+    r = SubElement(SubElement(tc, qn("w:p")), qn("w:r"))
+    if rpr is not None:
+        r.append(deepcopy(rpr))
+    t = SubElement(r, qn("w:t"))
+    t.set(qn("xml:space"), "preserve")
+    t.text = text
 
-    combined = conditions[0]
-    for cond in conditions[1:]:
-        combined = combined | cond
 
-    return df_tableau[combined].copy()
+def _write_header_row(tr, columns) -> None:
+    for tc, col in zip(tr.tc_lst, columns, strict=True):
+        _fast_cell_text(tc, col, _BOLD_RPR)
 
 
 def _add_dataframe_table(doc: DocumentType, df: pd.DataFrame) -> None:
     if len(df) == 0:
         return
 
-    table = doc.add_table(rows=1, cols=len(df.columns))
+    # Table dimensionnée d'emblée : évite un add_row() par ligne
+    table = doc.add_table(rows=len(df) + 1, cols=len(df.columns))
     table.style = "Light Grid Accent 1"
-
-    hdr_cells = table.rows[0].cells
-    for i, col in enumerate(df.columns):
-        hdr_cells[i].text = col
-        for paragraph in hdr_cells[i].paragraphs:
-            for run in paragraph.runs:
-                run.font.bold = True
-
-    for _, row in df.iterrows():
-        row_cells = table.add_row().cells
-        for i, value in enumerate(row):
-            row_cells[i].text = f"{value:,.2f}" if isinstance(value, (int, float)) else str(value)
+    # Remplissage direct des <w:tr>/<w:tc>, sans objets _Row/_Cell intermédiaires
+    tr_lst = table._tbl.tr_lst
+    _write_header_row(tr_lst[0], df.columns)
+
+    # Tout le tableau est formaté colonne par colonne (formateur choisi d'après le dtype) avant l'écriture
+    textes = [
+        serie.map(_format_montant if pd.api.types.is_numeric_dtype(serie.dtype) else str).tolist()
+        for _, serie in df.items()
+    ]
+    for tr, row in zip(tr_lst[1:], zip(*textes, strict=True), strict=True):
+        for tc, texte in zip(tr.tc_lst, row, strict=True):
+            _fast_cell_text(tc, texte)
 
 
 def _add_picture_with_caption(doc: DocumentType, path: str, caption: str) -> None:
-    if not Path(path).exists():
+    # Un seul open() sert à la fois de test d'existence et de flux pour python-docx
+    try:
+        with Path(path).open("rb") as image:
+            doc.add_picture(image, width=Inches(6.5))
+    except FileNotFoundError:
         return
-    doc.add_picture(path, width=Inches(6.5))
-    p = doc.add_paragraph(caption)
+    p = doc.add_paragraph()
     p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    p.runs[0].italic = True
+    p.add_run(caption).italic = True
+
+
+def _evm_indicateurs(ac: float, ev: float, pv: float) -> tuple[float, float, float, float]:
+    # Noyau scalaire (CV, SV, CPI, SPI) sur des float natifs, réutilisable en traitement par lots
+    cv = ev - ac
+    sv = ev - pv
+    cpi = ev / ac if ac > 0 else 0.0
+    spi = ev / pv if pv > 0 else 0.0
+    return cv, sv, cpi, spi
 
 
 def _compute_current_metrics(depenses_cumulees, pv_cumulee, ev_cumulee):
     dernier_mois = depenses_cumulees.index[-1]
-    ac_actuel = depenses_cumulees.iloc[-1]
+    # Accès direct au dernier élément du tableau numpy, sans passer par l'indexeur pandas
+    ac_actuel = float(depenses_cumulees.to_numpy()[-1])
 
-    ev_actuel = ev_cumulee.iloc[-1] if ev_cumulee is not None and len(ev_cumulee) > 0 else 0
-    pv_actuel = pv_cumulee[dernier_mois] if pv_cumulee is not None and dernier_mois in pv_cumulee.index else 0
+    ev_actuel = float(ev_cumulee.to_numpy()[-1]) if ev_cumulee is not None and len(ev_cumulee) > 0 else 0.0
+    pv_actuel = 0.0
+    if pv_cumulee is not None and len(pv_cumulee) > 0:
+        # Cas courant : PV se termine sur le même mois qu'AC, lecture positionnelle sans recherche de label
+        if pv_cumulee.index[-1] == dernier_mois:
+            pv_actuel = float(pv_cumulee.to_numpy()[-1])
+        elif dernier_mois in pv_cumulee.index:
+            pv_actuel = float(pv_cumulee.loc[dernier_mois])
 
-    cv_actuel = ev_actuel - ac_actuel
-    sv_actuel = ev_actuel - pv_actuel
-    cpi = ev_actuel / ac_actuel if ac_actuel > 0 else 0
-    spi = ev_actuel / pv_actuel if pv_actuel > 0 else 0
+    cv_actuel, sv_actuel, cpi, spi = _evm_indicateurs(ac_actuel, ev_actuel, pv_actuel)
 
     return {
         "dernier_mois": dernier_mois,
@@ -143,18 +291,29 @@ def _compute_current_metrics(depenses_cumulees, pv_cumulee, ev_cumulee):
         "sv": sv_actuel,
         "cpi": cpi,
         "spi": spi,
+        # Chaînes formatées une seule fois, partagées par les puces et l'interprétation
+        "ac_str": _format_montant(ac_actuel),
+        "ev_str": _format_montant(ev_actuel),
+        "pv_str": _format_montant(pv_actuel),
+        "cv_str": _format_montant(cv_actuel),
+        "sv_str": _format_montant(sv_actuel),
+        "abs_cv_str": _format_montant(abs(cv_actuel)),
+        "abs_sv_str": _format_montant(abs(sv_actuel)),
+        "cpi_str": f"{cpi:.2f}",
+        "spi_str": f"{spi:.2f}",
+        "cpi_pct_str": f"{cpi * 100:.1f}",
     }
 
 
-def _add_colored_bullet(doc: DocumentType, text: str, delta: float | None = None) -> None:
-    p = doc.add_paragraph(style=LIST_BULLET_STYLE)
-    run = p.add_run(text)
-    if delta is None:
-        return
-    if delta < 0:
-        run.font.color.rgb = COLOR_RED
-    elif delta > 0:
-        run.font.color.rgb = COLOR_GREEN
+def _add_colored_bullet(
+    doc: DocumentType, text: str, delta: float | None = None, *, bullet_style: ParagraphStyle
+) -> None:
+    rpr = None
+    if delta is not None and delta < 0:
+        rpr = _COLOR_RPR[COLOR_RED]
+    elif delta is not None and delta > 0:
+        rpr = _COLOR_RPR[COLOR_GREEN]
+    _add_list_paragraph(doc, text, bullet_style, rpr)
 
 
 def _add_realise_section(
@@ -164,64 +323,43 @@ def _add_realise_section(
     depenses_cumulees,
     pv_cumulee,
     ev_cumulee,
+    *,
+    bullet_style: ParagraphStyle,
 ):
-    doc.add_heading("2. Réalisé à Date", 1)
-    doc.add_heading("2.1 Tableau des Valeurs", 2)
+    _add_heading(doc, "2. Réalisé à Date", 1)
+    _add_heading(doc, "2.1 Tableau des Valeurs", 2)
     df_filtre = _filter_df_tableau(df_tableau)
     _add_dataframe_table(doc, df_filtre)
 
-    doc.add_heading("2.2 Graphique du Réalisé", 2)
+    _add_heading(doc, "2.2 Graphique du Réalisé", 2)
     _add_picture_with_caption(doc, fichier_graphique, "Figure 1: Courbes du réalisé - AC, PV, EV et variances")
 
-    doc.add_heading("2.3 Indicateurs de Performance Actuels", 2)
+    _add_heading(doc, "2.3 Indicateurs de Performance Actuels", 2)
     metrics = _compute_current_metrics(depenses_cumulees, pv_cumulee, ev_cumulee)
     doc.add_paragraph(f"Au mois de {metrics['dernier_mois']}:")
 
-    _add_colored_bullet(doc, f"Dépenses Réelles (AC): {metrics['ac']:,.2f} €")
-    _add_colored_bullet(doc, f"Valeur Acquise (EV): {metrics['ev']:,.2f} €")
-    _add_colored_bullet(doc, f"Valeur Planifiée (PV): {metrics['pv']:,.2f} €")
+    _add_colored_bullet(doc, f"Dépenses Réelles (AC): {metrics['ac_str']} €", bullet_style=bullet_style)
+    _add_colored_bullet(doc, f"Valeur Acquise (EV): {metrics['ev_str']} €", bullet_style=bullet_style)
+    _add_colored_bullet(doc, f"Valeur Planifiée (PV): {metrics['pv_str']} €", bullet_style=bullet_style)
     doc.add_paragraph()
-    _add_colored_bullet(doc, f"Cost Variance (CV): {metrics['cv']:,.2f} €", metrics["cv"])
-    _add_colored_bullet(doc, f"Schedule Variance (SV): {metrics['sv']:,.2f} €", metrics["sv"])
-    _add_colored_bullet(doc, f"Cost Performance Index (CPI): {metrics['cpi']:.2f}", metrics["cpi"] - 1)
-    _add_colored_bullet(doc, f"Schedule Performance Index (SPI): {metrics['spi']:.2f}", metrics["spi"] - 1)
+    _add_colored_bullet(doc, f"Cost Variance (CV): {metrics['cv_str']} €", metrics["cv"], bullet_style=bullet_style)
+    _add_colored_bullet(doc, f"Schedule Variance (SV): {metrics['sv_str']} €", metrics["sv"], bullet_style=bullet_style)
+    _add_colored_bullet(
+        doc, f"Cost Performance Index (CPI): {metrics['cpi_str']}", metrics["cpi"] - 1, bullet_style=bullet_style
+    )
+    _add_colored_bullet(
+        doc, f"Schedule Performance Index (SPI): {metrics['spi_str']}", metrics["spi"] - 1, bullet_style=bullet_style
+    )
 
     doc.add_paragraph()
-    p = doc.add_paragraph("Interprétation:")
-    p.runs[0].bold = True
-
-    cv = metrics["cv"]
-    sv = metrics["sv"]
-    cpi = metrics["cpi"]
-    if cv < 0:
-        doc.add_paragraph(
-            f"⚠ Le projet présente un dépassement de coût de {abs(cv):,.2f} € à date.", style=LIST_BULLET_STYLE
-        )
-    else:
-        doc.add_paragraph(
-            f"✓ Le projet est sous budget avec une économie de {cv:,.2f} € à date.", style=LIST_BULLET_STYLE
-        )
+    doc.add_paragraph().add_run("Interprétation:").bold = True
 
-    if sv < 0:
-        doc.add_paragraph(
-            f"⚠ Le projet présente un retard équivalent à {abs(sv):,.2f} € de travail non réalisé.",
-            style=LIST_BULLET_STYLE,
-        )
-    else:
-        doc.add_paragraph(
-            f"✓ Le projet est en avance avec {sv:,.2f} € de travail supplémentaire réalisé.", style=LIST_BULLET_STYLE
-        )
-
-    if cpi < 1:
-        doc.add_paragraph(
-            f"⚠ L'efficacité des coûts est de {cpi * 100:.1f}% (chaque euro dépensé génère {cpi:.2f} € de valeur).",
-            style=LIST_BULLET_STYLE,
-        )
-    else:
-        doc.add_paragraph(
-            f"✓ L'efficacité des coûts est de {cpi * 100:.1f}% (chaque euro dépensé génère {cpi:.2f} € de valeur).",
-            style=LIST_BULLET_STYLE,
-        )
+    for valeur, messages in (
+        (metrics["cv"], _CV_MESSAGES),
+        (metrics["sv"], _SV_MESSAGES),
+        (metrics["cpi"], _CPI_INTERPRETATION_MESSAGES),
+    ):
+        _add_list_paragraph(doc, _bucket(valeur, messages).format_map(metrics), bullet_style)
 
     doc.add_page_break()
     return metrics
@@ -253,230 +391,212 @@ def _build_scenarios_data(projections, budget_total: float):
     return scenarios_data
 
 
-def _bold_cell(cell) -> None:
-    for paragraph in cell.paragraphs:
-        for run in paragraph.runs:
-            run.font.bold = True
-
-
-def _color_cell(cell, color: RGBColor) -> None:
-    for paragraph in cell.paragraphs:
-        for run in paragraph.runs:
-            run.font.color.rgb = color
-
-
-def _fill_scenario_row(row_cells, row: pd.Series) -> None:
-    for i, (col, value) in enumerate(row.items()):
-        if col in [COL_EAC, COL_VAC]:
-            row_cells[i].text = f"{value:,.2f}"
-            if col == COL_VAC and value < 0:
-                _color_cell(row_cells[i], COLOR_RED)
+def _fill_scenario_row(tc_lst, row: tuple, *, montant_cols: frozenset[int], vac_col: int | None) -> None:
+    for i, (tc, value) in enumerate(zip(tc_lst, row, strict=True)):
+        if i in montant_cols:
+            _fast_cell_text(tc, _format_montant(value), _COLOR_RPR[COLOR_RED] if i == vac_col and value < 0 else None)
         else:
-            row_cells[i].text = str(value)
+            _fast_cell_text(tc, str(value))
 
 
 def _add_scenarios_table(doc: DocumentType, scenarios_data: list[dict]) -> None:
     if not scenarios_data:
         return
 
-    df_scenarios = pd.DataFrame(scenarios_data)
-    table = doc.add_table(rows=1, cols=len(df_scenarios.columns))
+    # Les dictionnaires partagent les mêmes clés, dans le même ordre : pas besoin de DataFrame
+    columns = list(scenarios_data[0])
+    table = doc.add_table(rows=len(scenarios_data) + 1, cols=len(columns))
     table.style = "Light Grid Accent 1"
+    tr_lst = table._tbl.tr_lst
+    _write_header_row(tr_lst[0], columns)
+
+    montant_cols = frozenset(i for i, col in enumerate(columns) if col in (COL_EAC, COL_VAC))
+    vac_col = columns.index(COL_VAC) if COL_VAC in columns else None
+    for tr, scenario in zip(tr_lst[1:], scenarios_data, strict=True):
+        row = tuple(scenario[col] for col in columns)
+        _fill_scenario_row(tr.tc_lst, row, montant_cols=montant_cols, vac_col=vac_col)
 
-    hdr_cells = table.rows[0].cells
-    for i, col in enumerate(df_scenarios.columns):
-        hdr_cells[i].text = col
-        _bold_cell(hdr_cells[i])
 
-    for _, row in df_scenarios.iterrows():
-        row_cells = table.add_row().cells
-        _fill_scenario_row(row_cells, row)
+def _classify_scenarios(scenarios_dict: dict[str, float]) -> dict[str, float]:
+    eac_par_type: dict[str, float] = {}
+    for libelle, eac in scenarios_dict.items():
+        for type_scenario, mots_cles in SCENARIO_KEYWORDS:
+            if any(mot in libelle for mot in mots_cles):
+                eac_par_type.setdefault(type_scenario, eac)
+                break
+    return eac_par_type
 
 
-def _add_projections_section(doc: DocumentType, projections, fichier_projections: str, budget_total: float):
-    doc.add_heading("3. Projections à Terminaison", 1)
-    doc.add_heading("3.1 Tableau Comparatif des Scénarios", 2)
+def _add_projections_section(
+    doc: DocumentType, projections, fichier_projections: str, budget_total: float, *, bullet_style: ParagraphStyle
+):
+    _add_heading(doc, "3. Projections à Terminaison", 1)
+    _add_heading(doc, "3.1 Tableau Comparatif des Scénarios", 2)
     scenarios_data = _build_scenarios_data(projections, budget_total)
     _add_scenarios_table(doc, scenarios_data)
 
-    doc.add_heading("3.2 Graphique des Projections", 2)
+    _add_heading(doc, "3.2 Graphique des Projections", 2)
     _add_picture_with_caption(
         doc, fichier_projections, "Figure 2: Projections à terminaison - Différents scénarios EAC"
     )
 
-    doc.add_heading("3.3 Analyse des Scénarios", 2)
+    _add_heading(doc, "3.3 Analyse des Scénarios", 2)
     if scenarios_data:
         scenarios_dict = {s["Scénario"]: s[COL_EAC] for s in scenarios_data}
 
-        eac_optimiste = next((v for k, v in scenarios_dict.items() if "Optimiste" in k), None)
-        eac_realiste = next((v for k, v in scenarios_dict.items() if "Réaliste" in k), None)
-        eac_pessimiste = next((v for k, v in scenarios_dict.items() if "Pessimiste" in k), None)
-        eac_forecast = next((v for k, v in scenarios_dict.items() if ("Forecast" in k or "Manuel" in k)), None)
+        eac_par_type = _classify_scenarios(scenarios_dict)
 
-        doc.add_paragraph(f"Budget Total (BAC): {budget_total:,.2f} €")
+        doc.add_paragraph(f"Budget Total (BAC): {_format_montant(budget_total)} €")
         doc.add_paragraph()
         doc.add_paragraph("Fourchette des projections:")
         for label, eac_val in scenarios_dict.items():
-            doc.add_paragraph(f"  • {label}: {eac_val:,.2f} €", style=LIST_BULLET_STYLE)
+            _add_list_paragraph(doc, f"  • {label}: {_format_montant(eac_val)} €", bullet_style)
 
         doc.add_paragraph()
-        p = doc.add_paragraph("Écarts par rapport au budget:")
-        p.runs[0].bold = True
-
-        for label, eac_val in [
-            ("Optimiste", eac_optimiste),
-            ("Réaliste", eac_realiste),
-            ("Pessimiste", eac_pessimiste),
-            ("Forecast", eac_forecast),
-        ]:
+        doc.add_paragraph().add_run("Écarts par rapport au budget:").bold = True
+
+        pct_par_euro = 100.0 / budget_total
+        for label, _ in SCENARIO_KEYWORDS:
+            eac_val = eac_par_type.get(label)
             if eac_val is None:
                 continue
             ecart = eac_val - budget_total
             signe = "+" if ecart >= 0 else ""
-            p = doc.add_paragraph(style=LIST_BULLET_STYLE)
-            run = p.add_run(f"  • {label}: {signe}{ecart:,.2f} € ({(ecart / budget_total) * 100:+.1f}%)")
-            run.font.color.rgb = COLOR_GREEN if ecart >= 0 else COLOR_RED
+            _add_list_paragraph(
+                doc,
+                _format_ecart(label=label, signe=signe, ecart=ecart, pct=ecart * pct_par_euro),
+                bullet_style,
+                _COLOR_RPR[COLOR_GREEN if ecart >= 0 else COLOR_RED],
+            )
 
     doc.add_page_break()
     return scenarios_data
 
 
-def _add_performance_summary(doc: DocumentType, *, cpi: float, spi: float) -> None:
+def _add_performance_summary(doc: DocumentType, *, cpi: float, spi: float, bullet_style: ParagraphStyle) -> None:
     doc.add_paragraph("Performance actuelle:")
-    if cpi < 0.9:
-        doc.add_paragraph(
-            "⚠ Le CPI est très faible, indiquant une efficacité des coûts préoccupante. Actions correctives urgentes recommandées.",
-            style=LIST_BULLET_STYLE,
-        )
-    elif cpi < 1:
-        doc.add_paragraph(
-            "⚠ Le CPI est inférieur à 1, indiquant un dépassement de coût. Une surveillance étroite est nécessaire.",
-            style=LIST_BULLET_STYLE,
-        )
-    else:
-        doc.add_paragraph(
-            "✓ Le CPI est supérieur à 1, indiquant une bonne efficacité des coûts.",
-            style=LIST_BULLET_STYLE,
-        )
-
-    if spi < 0.9:
-        doc.add_paragraph(
-            "⚠ Le SPI est très faible, indiquant un retard significatif. Révision du planning recommandée.",
-            style=LIST_BULLET_STYLE,
-        )
-    elif spi < 1:
-        doc.add_paragraph(
-            "⚠ Le SPI est inférieur à 1, indiquant un retard. Des mesures d'accélération devraient être envisagées.",
-            style=LIST_BULLET_STYLE,
-        )
-    else:
-        doc.add_paragraph(
-            "✓ Le SPI est supérieur à 1, indiquant une bonne performance sur les délais.",
-            style=LIST_BULLET_STYLE,
-        )
+    _add_list_paragraph(doc, _bucket(cpi, _CPI_MESSAGES), bullet_style)
+    _add_list_paragraph(doc, _bucket(spi, _SPI_MESSAGES), bullet_style)
 
     doc.add_paragraph()
 
 
-def _add_projection_summary(doc: DocumentType, scenarios_data: list[dict], budget_total: float) -> None:
-    if not scenarios_data:
-        return
-
+def _add_projection_summary(
+    doc: DocumentType, scenarios_data: list[dict], budget_total: float, *, bullet_style: ParagraphStyle
+) -> None:
     eacs_disponibles = [s[COL_EAC] for s in scenarios_data]
-    if not eacs_disponibles:
-        return
+    eac_min_calc = min(eacs_disponibles)
+    eac_max_calc = max(eacs_disponibles)
 
     doc.add_paragraph("Projections à terminaison:")
-    all_over = all(eac > budget_total for eac in eacs_disponibles)
-    any_over = any(eac > budget_total for eac in eacs_disponibles)
-    if all_over:
-        doc.add_paragraph(
+    # Tous au-dessus du budget <=> le plus petit l'est ; au moins un <=> le plus grand l'est
+    if eac_min_calc > budget_total:
+        _add_list_paragraph(
+            doc,
             "⚠ Tous les scénarios prévoient un dépassement de budget. Des mesures correctives sont nécessaires.",
-            style=LIST_BULLET_STYLE,
+            bullet_style,
         )
-    elif any_over:
-        doc.add_paragraph(
+    elif eac_max_calc > budget_total:
+        _add_list_paragraph(
+            doc,
             "⚠ Certains scénarios prévoient un dépassement de budget. Une vigilance accrue est requise.",
-            style=LIST_BULLET_STYLE,
+            bullet_style,
         )
     else:
-        doc.add_paragraph(
-            "✓ Les projections indiquent un achèvement sous budget dans tous les scénarios.",
-            style=LIST_BULLET_STYLE,
+        _add_list_paragraph(
+            doc, "✓ Les projections indiquent un achèvement sous budget dans tous les scénarios.", bullet_style
         )
 
-    eac_min_calc = min(eacs_disponibles)
-    eac_max_calc = max(eacs_disponibles)
     ecart_relatif = ((eac_max_calc - eac_min_calc) / budget_total) * 100
     if ecart_relatif > 10:
-        doc.add_paragraph(
+        _add_list_paragraph(
+            doc,
             f"⚠ L'écart entre scénarios est important ({ecart_relatif:.1f}% du budget), reflétant une forte incertitude.",
-            style=LIST_BULLET_STYLE,
+            bullet_style,
         )
     elif ecart_relatif > 5:
-        doc.add_paragraph(
-            f"ℹ L'écart entre scénarios est modéré ({ecart_relatif:.1f}% du budget).",
-            style=LIST_BULLET_STYLE,
+        _add_list_paragraph(
+            doc, f"ℹ L'écart entre scénarios est modéré ({ecart_relatif:.1f}% du budget).", bullet_style
         )
     else:
-        doc.add_paragraph(
+        _add_list_paragraph(
+            doc,
             f"✓ L'écart entre scénarios est faible ({ecart_relatif:.1f}% du budget), indiquant une bonne prévisibilité.",
-            style=LIST_BULLET_STYLE,
+            bullet_style,
         )
 
 
-def _add_recommendations(doc: DocumentType, *, cpi: float, spi: float, has_negative_vac: bool) -> None:
-    doc.add_heading("4.2 Recommandations", 2)
+def _add_recommendations(
+    doc: DocumentType,
+    *,
+    cpi: float,
+    spi: float,
+    has_negative_vac: bool,
+) -> None:
+    _add_heading(doc, "4.2 Recommandations", 2)
 
-    if cpi < 1 or spi < 1 or has_negative_vac:
+    needs_corrective = cpi < 1 or spi < 1 or has_negative_vac
+    if needs_corrective:
+        # Style des listes numérotées résolu seulement quand des actions sont à lister
+        number_style = doc.styles[LIST_NUMBER_STYLE]
         doc.add_paragraph("Actions recommandées:")
 
         if cpi < 1:
-            doc.add_paragraph(
+            _add_list_paragraph(
+                doc,
                 "1. Analyser les causes du dépassement de coût et identifier les postes problématiques",
-                style=LIST_NUMBER_STYLE,
+                number_style,
             )
-            doc.add_paragraph(
-                "2. Mettre en place des mesures de réduction des coûts ou réviser le scope",
-                style=LIST_NUMBER_STYLE,
+            _add_list_paragraph(
+                doc, "2. Mettre en place des mesures de réduction des coûts ou réviser le scope", number_style
             )
 
         if spi < 1:
-            doc.add_paragraph(
-                "3. Revoir la planification et identifier les leviers d'accélération",
-                style=LIST_NUMBER_STYLE,
-            )
-            doc.add_paragraph(
-                "4. Augmenter les ressources si nécessaire pour rattraper le retard",
-                style=LIST_NUMBER_STYLE,
+            _add_list_paragraph(
+                doc, "3. Revoir la planification et identifier les leviers d'accélération", number_style
             )
+            _add_list_paragraph(doc, "4. Augmenter les ressources si nécessaire pour rattraper le retard", number_style)
 
         if has_negative_vac:
-            doc.add_paragraph(
-                "5. Prévoir un budget de contingence pour couvrir le dépassement projeté",
-                style=LIST_NUMBER_STYLE,
+            _add_list_paragraph(
+                doc, "5. Prévoir un budget de contingence pour couvrir le dépassement projeté", number_style
             )
-            doc.add_paragraph(
-                "6. Communiquer proactivement avec les parties prenantes sur les risques financiers",
-                style=LIST_NUMBER_STYLE,
+            _add_list_paragraph(
+                doc, "6. Communiquer proactivement avec les parties prenantes sur les risques financiers", number_style
             )
         return
 
-    doc.add_paragraph("Le projet montre de bonnes performances. Recommandations:", style=LIST_BULLET_STYLE)
-    doc.add_paragraph("  • Maintenir les pratiques actuelles de gestion", style=LIST_BULLET_STYLE)
-    doc.add_paragraph("  • Continuer la surveillance régulière des indicateurs", style=LIST_BULLET_STYLE)
-    doc.add_paragraph("  • Capitaliser sur les bonnes pratiques pour les projets futurs", style=LIST_BULLET_STYLE)
+    _append_cached_xml(doc, _bonnes_pratiques_xml())
+
+
+@cache
+def _bonnes_pratiques_xml() -> tuple:
+    modele = Document()
+    bullet_style = modele.styles[LIST_BULLET_STYLE]
+    modele.add_paragraph("Le projet montre de bonnes performances. Recommandations:", style=bullet_style)
+    modele.add_paragraph("  • Maintenir les pratiques actuelles de gestion", style=bullet_style)
+    modele.add_paragraph("  • Continuer la surveillance régulière des indicateurs", style=bullet_style)
+    modele.add_paragraph("  • Capitaliser sur les bonnes pratiques pour les projets futurs", style=bullet_style)
+    return _body_xml(modele)
 
 
 def _add_conclusion_section(
-    doc: DocumentType, *, cpi: float, spi: float, scenarios_data: list[dict], budget_total: float
+    doc: DocumentType,
+    *,
+    cpi: float,
+    spi: float,
+    scenarios_data: list[dict],
+    budget_total: float,
+    bullet_style: ParagraphStyle,
 ) -> None:
-    doc.add_heading("4. Conclusion et Recommandations", 1)
-    doc.add_heading("4.1 Synthèse", 2)
+    _add_heading(doc, "4. Conclusion et Recommandations", 1)
+    _add_heading(doc, "4.1 Synthèse", 2)
 
-    _add_performance_summary(doc, cpi=cpi, spi=spi)
-    _add_projection_summary(doc, scenarios_data, budget_total)
-    has_negative_vac = any(s[COL_VAC] < 0 for s in scenarios_data) if scenarios_data else False
+    _add_performance_summary(doc, cpi=cpi, spi=spi, bullet_style=bullet_style)
+    has_negative_vac = False
+    if scenarios_data:
+        _add_projection_summary(doc, scenarios_data, budget_total, bullet_style=bullet_style)
+        has_negative_vac = any(s[COL_VAC] < 0 for s in scenarios_data)
     _add_recommendations(doc, cpi=cpi, spi=spi, has_negative_vac=has_negative_vac)
 
 
@@ -506,19 +626,36 @@ def generer_rapport_word(
     print(f"\n=== Génération du rapport Word: {fichier_word} ===")
 
     doc = Document()
+    # Style des puces résolu une seule fois par document plutôt qu'à chaque paragraphe
+    bullet_style = doc.styles[LIST_BULLET_STYLE]
+
     _add_title_page(doc)
     _add_definitions_section(doc)
 
-    metrics = _add_realise_section(doc, df_tableau, fichier_graphique, depenses_cumulees, pv_cumulee, ev_cumulee)
+    metrics = _add_realise_section(
+        doc,
+        df_tableau,
+        fichier_graphique,
+        depenses_cumulees,
+        pv_cumulee,
+        ev_cumulee,
+        bullet_style=bullet_style,
+    )
     budget_total = pv_cumulee.iloc[-1] if pv_cumulee is not None else 0
-    scenarios_data = _add_projections_section(doc, projections, fichier_projections, budget_total)
+    scenarios_data = _add_projections_section(
+        doc, projections, fichier_projections, budget_total, bullet_style=bullet_style
+    )
     _add_conclusion_section(
         doc,
         cpi=metrics["cpi"],
         spi=metrics["spi"],
         scenarios_data=scenarios_data,
         budget_total=budget_total,
+        bullet_style=bullet_style,
     )
 
-    doc.save(fichier_word)
+    # Sérialisation complète en mémoire, puis une seule écriture sur disque
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    Path(fichier_word).write_bytes(buffer.getbuffer())
     print(f"✓ Rapport Word généré: {fichier_word}")
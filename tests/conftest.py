@@ -2,23 +2,84 @@
 Configuration pytest et fixtures communes
 """
 
-import sys
+from collections.abc import Callable
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pytest
 
-# Ajouter le répertoire parent au path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from tests.utils import ecrire_xlsx, index_mensuel
+
+
+@pytest.fixture(scope="session")
+def fichier_xlsx_session(tmp_path_factory) -> Callable[[str, Callable[[], pd.DataFrame]], Path]:
+    """Fixture fabrique : écrit chaque DataFrame en .xlsx une seule fois par session, sous le nom donné"""
+    repertoire = tmp_path_factory.mktemp("xlsx")
+    fichiers: dict[str, Path] = {}
+
+    def ecrire(nom: str, construire: Callable[[], pd.DataFrame]) -> Path:
+        if nom not in fichiers:
+            fichier = repertoire / f"{nom}.xlsx"
+            ecrire_xlsx(construire(), fichier)
+            fichiers[nom] = fichier
+        return fichiers[nom]
+
+    return ecrire
+
+
+@pytest.fixture(scope="session")
+def fichier_export_volumineux(fichier_xlsx_session) -> Path:
+    """Fixture pour un export SAP de six ans de dépenses journalières"""
+
+    def construire() -> pd.DataFrame:
+        dates = pd.date_range(start="2020-01-01", end="2025-12-31", freq="D")
+        return pd.DataFrame({"Date de la pièce": dates, "Val./Devise objet": [1000.0] * len(dates)})
+
+    return fichier_xlsx_session("volumineux", construire)
+
+
+def _construire_sap_1_ligne() -> pd.DataFrame:
+    """Construit un export SAP minimal d'une seule dépense"""
+    return pd.DataFrame({"Date de la pièce": pd.to_datetime(["2025-01-15"]), "Val./Devise objet": [10000]})
 
 
 @pytest.fixture
-def sample_export_sap() -> pd.DataFrame:
-    """Fixture pour un export SAP exemple"""
+def sap_1row() -> pd.DataFrame:
+    """Fixture pour un export SAP minimal d'une seule dépense"""
+    return _construire_sap_1_ligne()
+
+
+@pytest.fixture(scope="session")
+def sap_xlsx_1row(fichier_xlsx_session) -> Path:
+    """Fixture pour le .xlsx d'un export SAP minimal d'une seule dépense"""
+    return fichier_xlsx_session("sap_1_ligne", _construire_sap_1_ligne)
+
+
+@pytest.fixture(scope="session")
+def fichier_pv_nombreux_jalons(fichier_xlsx_session) -> Path:
+    """Fixture pour un fichier PV de 1000 jalons"""
+
+    def construire() -> pd.DataFrame:
+        n_jalons = 1000
+        return pd.DataFrame(
+            {
+                "Jalon": np.char.add("J", np.arange(n_jalons).astype(str)),
+                "Date": pd.date_range("2025-01-01", periods=n_jalons, freq="D"),
+                "Montant planifié": 10000,
+                "Cumul planifié": np.arange(1, n_jalons + 1, dtype=np.int64) * 10000,
+            }
+        )
+
+    return fichier_xlsx_session("nombreux_jalons", construire)
+
+
+def _construire_export_sap() -> pd.DataFrame:
+    """Construit un export SAP exemple"""
     return pd.DataFrame(
         {
-            "Date de la pièce": [datetime(2025, 1, 15), datetime(2025, 2, 20), datetime(2025, 3, 10)],
+            "Date de la pièce": pd.to_datetime(["2025-01-15", "2025-02-20", "2025-03-10"]),
             "Val./Devise objet": [15000.50, 25000.75, 18500.00],
             "Document d'achat": [24184688.0, 24309176.0, 24346974.0],
         }
@@ -26,13 +87,24 @@ def sample_export_sap() -> pd.DataFrame:
 
 
 @pytest.fixture
-def sample_pv() -> pd.DataFrame:
-    """Fixture pour un fichier PV exemple"""
+def sample_export_sap() -> pd.DataFrame:
+    """Fixture pour un export SAP exemple"""
+    return _construire_export_sap()
+
+
+@pytest.fixture(scope="session")
+def sample_export_sap_xlsx(fichier_xlsx_session) -> Path:
+    """Fixture pour le .xlsx de l'export SAP exemple, écrit une seule fois par session"""
+    return fichier_xlsx_session("sample_export_sap", _construire_export_sap)
+
+
+def _construire_pv() -> pd.DataFrame:
+    """Construit le contenu d'un fichier PV exemple"""
     return pd.DataFrame(
         {
             "Jalon": ["RCD", "J1", "J2"],
             "Durée (mois)": [3, 5, 4],
-            "Date": [datetime(2025, 3, 31), datetime(2025, 8, 31), datetime(2025, 12, 31)],
+            "Date": pd.to_datetime(["2025-03-31", "2025-08-31", "2025-12-31"]),
             "Montant planifié": [100000, 200000, 250000],
             "Cumul planifié": [100000, 300000, 550000],
         }
@@ -40,11 +112,22 @@ def sample_pv() -> pd.DataFrame:
 
 
 @pytest.fixture
-def sample_va() -> pd.DataFrame:
-    """Fixture pour un fichier VA exemple"""
-    data: dict[str | datetime, list] = {
+def sample_pv() -> pd.DataFrame:
+    """Fixture pour un fichier PV exemple"""
+    return _construire_pv()
+
+
+@pytest.fixture(scope="session")
+def sample_pv_xlsx(fichier_xlsx_session) -> Path:
+    """Fixture pour le .xlsx du fichier PV exemple, écrit une seule fois par session"""
+    return fichier_xlsx_session("sample_pv", _construire_pv)
+
+
+def _construire_va() -> pd.DataFrame:
+    """Construit le contenu d'un fichier VA exemple"""
+    data: dict[str | datetime, list | pd.DatetimeIndex] = {
         "Jalon": ["RCD", "J1", "J2"],
-        "Date": [datetime(2025, 3, 31), datetime(2025, 8, 31), datetime(2025, 12, 31)],
+        "Date": pd.to_datetime(["2025-03-31", "2025-08-31", "2025-12-31"]),
         "Montant planifié": [100000, 200000, 250000],
         "Cumul planifié": [100000, 300000, 550000],
     }
@@ -63,12 +146,23 @@ def sample_va() -> pd.DataFrame:
 
 
 @pytest.fixture
-def sample_forecast() -> pd.DataFrame:
-    """Fixture pour un fichier forecast exemple"""
+def sample_va() -> pd.DataFrame:
+    """Fixture pour un fichier VA exemple"""
+    return _construire_va()
+
+
+@pytest.fixture(scope="session")
+def sample_va_xlsx(fichier_xlsx_session) -> Path:
+    """Fixture pour le .xlsx du fichier VA exemple, écrit une seule fois par session"""
+    return fichier_xlsx_session("sample_va", _construire_va)
+
+
+def _construire_forecast() -> pd.DataFrame:
+    """Construit le contenu d'un fichier forecast exemple"""
     return pd.DataFrame(
         {
             "Jalon": ["J3", "J4", "POV"],
-            "Date projetée": [datetime(2026, 7, 31), datetime(2026, 10, 31), datetime(2027, 6, 30)],
+            "Date projetée": pd.to_datetime(["2026-07-31", "2026-10-31", "2027-06-30"]),
             "EAC (€)": [420000, 230000, 20000],
             "ETC (€)": [420000, 230000, 20000],
             "Commentaire": ["Test 1", "Test 2", "Test 3"],
@@ -76,19 +170,31 @@ def sample_forecast() -> pd.DataFrame:
     )
 
 
+@pytest.fixture
+def sample_forecast() -> pd.DataFrame:
+    """Fixture pour un fichier forecast exemple"""
+    return _construire_forecast()
+
+
+@pytest.fixture(scope="session")
+def sample_forecast_xlsx(fichier_xlsx_session) -> Path:
+    """Fixture pour le .xlsx du fichier forecast exemple, écrit une seule fois par session"""
+    return fichier_xlsx_session("sample_forecast", _construire_forecast)
+
+
 @pytest.fixture
 def sample_depenses_cumulees() -> pd.Series:
     """Fixture pour des dépenses cumulées exemple"""
-    return pd.Series([50000, 100000, 180000, 250000], index=pd.period_range("2025-01", periods=4, freq="M"))
+    return pd.Series([50000, 100000, 180000, 250000], index=index_mensuel(4))
 
 
 @pytest.fixture
 def sample_ev_cumulee() -> pd.Series:
     """Fixture pour une EV cumulée exemple"""
-    return pd.Series([30000, 70000, 120000, 180000], index=pd.period_range("2025-01", periods=4, freq="M"))
+    return pd.Series([30000, 70000, 120000, 180000], index=index_mensuel(4))
 
 
 @pytest.fixture
 def sample_pv_cumulee() -> pd.Series:
     """Fixture pour une PV cumulée exemple"""
-    return pd.Series([40000, 90000, 140000, 200000], index=pd.period_range("2025-01", periods=4, freq="M"))
+    return pd.Series([40000, 90000, 140000, 200000], index=index_mensuel(4))
@@ -2,14 +2,11 @@
 Tests pour les calculs EVM (AC, PV, EV)
 """
 
-import sys
 from datetime import datetime
-from pathlib import Path
 
 import pandas as pd
 import pytest
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
 from analyse import calculer_depenses_cumulees, calculer_earned_value, traiter_planned_value
 
 
@@ -2,110 +2,53 @@
 Tests pour les fonctions de génération de graphiques
 """
 
-import sys
 from collections.abc import Hashable
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
+import matplotlib as mpl
+
+mpl.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
+import pytest
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
 from analyse import tracer_courbe, tracer_courbe_projections
+from src.visualisation import graphiques
+from src.visualisation.graphiques import _annotate_key_points, _index_to_ts, _new_figure, _plot_ac, _plot_variance
+from tests.utils import index_mensuel
+
+# Séries et jalons optionnels de tracer_courbe, partagés par les cas paramétrés
+_PV = pd.Series([60000, 120000, 180000], index=index_mensuel(3))
+_EV = pd.Series([55000, 110000, 165000], index=index_mensuel(3))
+_EAC = pd.Series([200000, 200000, 200000], index=index_mensuel(3))
+_JLN: dict[Hashable, list[str]] = {
+    pd.Period("2025-01", freq="M"): ["Jalon 1", "Jalon 2"],
+    pd.Period("2025-03", freq="M"): ["Jalon 3"],
+}
 
 
 class TestTracerCourbe:
     """Tests pour la fonction tracer_courbe"""
 
-    def test_tracer_courbe_ac_seulement(self, tmp_path: Path) -> None:
-        """Test avec seulement les dépenses réelles (AC)"""
-        fichier = tmp_path / "graphique.png"
-
-        # Données de test
-        depenses = pd.Series(
-            [50000, 100000, 150000],
-            index=pd.period_range(start="2025-01", periods=3, freq="M"),
-        )
-
-        with patch("matplotlib.pyplot.savefig") as mock_save, patch("matplotlib.pyplot.close"):
-            tracer_courbe(depenses, fichier_sortie=str(fichier))
-            mock_save.assert_called_once()
-
-    def test_tracer_courbe_ac_pv(self, tmp_path: Path) -> None:
-        """Test avec AC et PV"""
+    @pytest.mark.parametrize(
+        ("pv", "jalons", "ev", "eac"),
+        [
+            (None, None, None, None),
+            (_PV, _JLN, None, None),
+            (_PV, None, _EV, None),
+            (_PV, _JLN, _EV, _EAC),
+        ],
+        ids=["ac_seulement", "ac_pv", "ac_pv_ev", "toutes_donnees"],
+    )
+    def test_tracer_courbe(self, tmp_path: Path, pv, jalons, ev, eac) -> None:
+        """Test avec les dépenses réelles (AC) et les combinaisons de PV, jalons, EV et EAC"""
         fichier = tmp_path / "graphique.png"
+        depenses = pd.Series([50000, 100000, 150000], index=index_mensuel(3))
 
-        depenses = pd.Series(
-            [50000, 100000, 150000],
-            index=pd.period_range(start="2025-01", periods=3, freq="M"),
-        )
-
-        pv = pd.Series(
-            [60000, 120000, 180000],
-            index=pd.period_range(start="2025-01", periods=3, freq="M"),
-        )
-
-        jalons: dict[Hashable, list[str]] = {
-            pd.Period("2025-01", freq="M"): ["J1"],
-            pd.Period("2025-03", freq="M"): ["J2"],
-        }
-
-        with patch("matplotlib.pyplot.savefig") as mock_save, patch("matplotlib.pyplot.close"):
-            tracer_courbe(depenses, pv, jalons, fichier_sortie=str(fichier))
-            mock_save.assert_called_once()
-
-    def test_tracer_courbe_ac_pv_ev(self, tmp_path: Path) -> None:
-        """Test avec AC, PV et EV"""
-        fichier = tmp_path / "graphique.png"
-
-        depenses = pd.Series(
-            [50000, 100000, 150000],
-            index=pd.period_range(start="2025-01", periods=3, freq="M"),
-        )
-
-        pv = pd.Series(
-            [60000, 120000, 180000],
-            index=pd.period_range(start="2025-01", periods=3, freq="M"),
-        )
-
-        ev = pd.Series(
-            [55000, 110000, 165000],
-            index=pd.period_range(start="2025-01", periods=3, freq="M"),
-        )
-
-        with patch("matplotlib.pyplot.savefig") as mock_save, patch("matplotlib.pyplot.close"):
-            tracer_courbe(depenses, pv, None, ev, fichier_sortie=str(fichier))
-            mock_save.assert_called_once()
-
-    def test_tracer_courbe_toutes_donnees(self, tmp_path: Path) -> None:
-        """Test avec toutes les données (AC, PV, EV, jalons, EAC)"""
-        fichier = tmp_path / "graphique_complet.png"
-
-        depenses = pd.Series(
-            [50000, 100000, 150000],
-            index=pd.period_range(start="2025-01", periods=3, freq="M"),
-        )
-
-        pv = pd.Series(
-            [60000, 120000, 180000],
-            index=pd.period_range(start="2025-01", periods=3, freq="M"),
-        )
-
-        ev = pd.Series(
-            [55000, 110000, 165000],
-            index=pd.period_range(start="2025-01", periods=3, freq="M"),
-        )
-
-        eac = pd.Series(
-            [200000, 200000, 200000],
-            index=pd.period_range(start="2025-01", periods=3, freq="M"),
-        )
-
-        jalons: dict[Hashable, list[str]] = {
-            pd.Period("2025-01", freq="M"): ["Jalon 1", "Jalon 2"],
-            pd.Period("2025-03", freq="M"): ["Jalon 3"],
-        }
-
-        with patch("matplotlib.pyplot.savefig") as mock_save, patch("matplotlib.pyplot.close"):
+        with patch("matplotlib.figure.Figure.savefig") as mock_save, patch("matplotlib.pyplot.close"):
             tracer_courbe(depenses, pv, jalons, ev, eac_projete=eac, fichier_sortie=str(fichier))
             mock_save.assert_called_once()
 
@@ -119,26 +62,26 @@ class TestTracerProjections:
 
         depenses = pd.Series(
             [50000, 100000, 150000],
-            index=pd.period_range(start="2025-01", periods=3, freq="M"),
+            index=index_mensuel(3),
         )
 
         ev = pd.Series(
             [55000, 110000, 165000],
-            index=pd.period_range(start="2025-01", periods=3, freq="M"),
+            index=index_mensuel(3),
         )
 
         projections = {
             "cpi": {
                 "series": pd.Series(
                     [200000, 250000],
-                    index=pd.period_range(start="2025-04", periods=2, freq="M"),
+                    index=index_mensuel(2, "2025-04"),
                 ),
                 "eac": 250000,
                 "date": pd.Period("2025-05", freq="M"),
             }
         }
 
-        with patch("matplotlib.pyplot.savefig") as mock_save, patch("matplotlib.pyplot.close"):
+        with patch("matplotlib.figure.Figure.savefig") as mock_save, patch("matplotlib.pyplot.close"):
             tracer_courbe_projections(depenses, ev, projections, str(fichier))
             mock_save.assert_called_once()
 
@@ -148,19 +91,19 @@ class TestTracerProjections:
 
         depenses = pd.Series(
             [50000, 100000, 150000],
-            index=pd.period_range(start="2025-01", periods=3, freq="M"),
+            index=index_mensuel(3),
         )
 
         ev = pd.Series(
             [55000, 110000, 165000],
-            index=pd.period_range(start="2025-01", periods=3, freq="M"),
+            index=index_mensuel(3),
         )
 
         projections = {
             "cpi": {
                 "series": pd.Series(
                     [200000, 250000, 300000],
-                    index=pd.period_range(start="2025-04", periods=3, freq="M"),
+                    index=index_mensuel(3, "2025-04"),
                 ),
                 "eac": 300000,
                 "date": pd.Period("2025-06", freq="M"),
@@ -168,7 +111,7 @@ class TestTracerProjections:
             "cpi_spi": {
                 "series": pd.Series(
                     [210000, 260000, 310000],
-                    index=pd.period_range(start="2025-04", periods=3, freq="M"),
+                    index=index_mensuel(3, "2025-04"),
                 ),
                 "eac": 310000,
                 "date": pd.Period("2025-06", freq="M"),
@@ -176,7 +119,7 @@ class TestTracerProjections:
             "reste_plan": {
                 "series": pd.Series(
                     [190000, 240000, 290000],
-                    index=pd.period_range(start="2025-04", periods=3, freq="M"),
+                    index=index_mensuel(3, "2025-04"),
                 ),
                 "eac": 290000,
                 "date": pd.Period("2025-06", freq="M"),
@@ -184,57 +127,105 @@ class TestTracerProjections:
             "forecast": {
                 "series": pd.Series(
                     [220000, 270000, 320000],
-                    index=pd.period_range(start="2025-04", periods=3, freq="M"),
+                    index=index_mensuel(3, "2025-04"),
                 ),
                 "eac": 320000,
                 "date": pd.Period("2025-06", freq="M"),
             },
         }
 
-        with patch("matplotlib.pyplot.savefig") as mock_save, patch("matplotlib.pyplot.close"):
+        with patch("matplotlib.figure.Figure.savefig") as mock_save, patch("matplotlib.pyplot.close"):
             tracer_courbe_projections(depenses, ev, projections, str(fichier))
             mock_save.assert_called_once()
 
 
+@pytest.fixture
+def pyplot_factice(monkeypatch):
+    """Remplace pyplot par un unique MagicMock dans le module de graphiques"""
+    faux_plt = MagicMock()
+    faux_plt.subplots.return_value = (MagicMock(), MagicMock())
+    monkeypatch.setattr(graphiques, "_plt", lambda: faux_plt)
+    return faux_plt
+
+
 class TestGraphiquesSimplifies:
     """Tests simplifiés pour couvrir les fonctions de graphiques"""
 
-    def test_tracer_courbe_minimal(self, tmp_path):
+    def test_tracer_courbe_minimal(self, tmp_path, pyplot_factice):
         """Test minimal avec mock complet"""
         fichier = tmp_path / "minimal.png"
-        depenses = pd.Series([50000], index=pd.period_range(start="2025-01", periods=1, freq="M"))
-
-        with (
-            patch("matplotlib.pyplot.savefig"),
-            patch("matplotlib.pyplot.close"),
-            patch("matplotlib.pyplot.figure"),
-            patch("matplotlib.pyplot.plot"),
-            patch("matplotlib.pyplot.xlabel"),
-            patch("matplotlib.pyplot.ylabel"),
-            patch("matplotlib.pyplot.title"),
-            patch("matplotlib.pyplot.legend"),
-            patch("matplotlib.pyplot.grid"),
-            patch("matplotlib.pyplot.tight_layout"),
-        ):
-            tracer_courbe(depenses, fichier_sortie=str(fichier))
-
-    def test_tracer_projections_minimal(self, tmp_path):
+        depenses = pd.Series([50000], index=index_mensuel(1))
+
+        tracer_courbe(depenses, fichier_sortie=str(fichier))
+        pyplot_factice.close.assert_called_once()
+
+    def test_tracer_projections_minimal(self, tmp_path, pyplot_factice):
         """Test minimal des projections avec mock complet"""
         fichier = tmp_path / "projections_minimal.png"
-        depenses = pd.Series([50000], index=pd.period_range(start="2025-01", periods=1, freq="M"))
+        depenses = pd.Series([50000], index=index_mensuel(1))
         projections = {}
 
-        with (
-            patch("matplotlib.pyplot.savefig"),
-            patch("matplotlib.pyplot.close"),
-            patch("matplotlib.pyplot.figure"),
-            patch("matplotlib.pyplot.plot"),
-            patch("matplotlib.pyplot.axhline"),
-            patch("matplotlib.pyplot.xlabel"),
-            patch("matplotlib.pyplot.ylabel"),
-            patch("matplotlib.pyplot.title"),
-            patch("matplotlib.pyplot.legend"),
-            patch("matplotlib.pyplot.grid"),
-            patch("matplotlib.pyplot.tight_layout"),
-        ):
-            tracer_courbe_projections(depenses, None, projections, str(fichier))
+        tracer_courbe_projections(depenses, None, projections, str(fichier))
+        pyplot_factice.close.assert_called_once()
+
+
+class TestAnnotationsPointsCles:
+    """Tests pour la sélection des points annotés"""
+
+    def test_annote_un_point_sur_step_et_le_dernier(self):
+        """Test que seuls les points espacés de `step` et le dernier sont annotés"""
+        dates = index_mensuel(12).to_timestamp().to_numpy()
+        valeurs = pd.Series(range(12), dtype=float).to_numpy()
+
+        ax = MagicMock()
+        _annotate_key_points(ax, dates, valeurs, step_divisor=6)
+
+        textes = [c.args[2] for c in ax.text.call_args_list]
+        assert textes == ["0", "2", "4", "6", "8", "10", "11"]
+
+    def test_serie_vide(self):
+        """Test qu'une série vide ne produit aucune annotation"""
+        ax = MagicMock()
+        _annotate_key_points(ax, [], [])
+
+        ax.text.assert_not_called()
+
+
+class TestDatesVectorisees:
+    """Tests vérifiant que les dates sont transmises à matplotlib sous forme de tableaux datetime64"""
+
+    def test_dates_ac_datetime64(self, sample_depenses_cumulees):
+        """Test que la courbe AC reçoit un tableau numpy datetime64"""
+        fig, ax = _new_figure()
+        try:
+            _plot_ac(ax, sample_depenses_cumulees)
+            xdata = ax.lines[0].get_xdata()
+        finally:
+            plt.close(fig)
+
+        assert isinstance(xdata, np.ndarray)
+        assert np.issubdtype(xdata.dtype, np.datetime64)
+
+    def test_dates_variances_datetime64(self, sample_depenses_cumulees, sample_pv_cumulee, sample_ev_cumulee):
+        """Test que les courbes CV et SV reçoivent des tableaux numpy datetime64"""
+        fig, ax = _new_figure()
+        try:
+            _plot_variance(ax, sample_depenses_cumulees, sample_pv_cumulee, sample_ev_cumulee)
+            xdatas = [line.get_xdata() for line in ax.lines]
+        finally:
+            plt.close(fig)
+
+        assert len(xdatas) == 2
+        for xdata in xdatas:
+            assert np.issubdtype(xdata.dtype, np.datetime64)
+
+    def test_conversion_index_reutilisee(self, sample_depenses_cumulees):
+        """Test que la conversion d'un même index est réutilisée au sein d'un graphique, et pas au-delà"""
+        index = sample_depenses_cumulees.index
+        dates_par_index = {}
+
+        premier = _index_to_ts(index, dates_par_index)
+
+        assert _index_to_ts(index, dates_par_index) is premier
+        assert _index_to_ts(index.copy(), dates_par_index) is not premier
+        assert _index_to_ts(index) is not premier
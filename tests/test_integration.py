@@ -2,10 +2,10 @@
 Tests d'intégration pour le workflow complet
 """
 
-import sys
-from pathlib import Path
+from datetime import datetime
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import pandas as pd
+import pytest
 
 from analyse import (
     calculer_depenses_cumulees,
@@ -16,82 +16,85 @@ from analyse import (
     lire_valeur_acquise,
     traiter_planned_value,
 )
+from tests.utils import ecrire_xlsx
 
 
-class TestWorkflowComplet:
-    """Tests d'intégration pour le workflow complet"""
+@pytest.fixture(scope="class")
+def workflow_results(sample_export_sap_xlsx, sample_pv_xlsx, sample_va_xlsx) -> dict:
+    """Fixture exécutant une seule fois par classe les étapes 1 à 4 du workflow (lectures, AC, PV, EV)"""
+    # 1. Lire l'export SAP
+    df_sap = lire_export_sap(str(sample_export_sap_xlsx))
+    assert df_sap is not None
 
-    def test_workflow_avec_tous_fichiers(self, tmp_path, sample_export_sap, sample_pv, sample_va):
-        """Test du workflow complet avec tous les fichiers"""
+    # 2. Calculer les dépenses cumulées
+    ac = calculer_depenses_cumulees(df_sap, "Date de la pièce", "Val./Devise objet")
 
-        # Créer les fichiers temporaires
-        fichier_sap = tmp_path / "export.xlsx"
-        fichier_pv = tmp_path / "pv.xlsx"
-        fichier_va = tmp_path / "va.xlsx"
+    # 3. Lire et traiter la PV
+    df_pv = lire_planned_value(str(sample_pv_xlsx))
+    assert df_pv is not None
+    result_pv = traiter_planned_value(df_pv)
+    assert result_pv is not None
+    pv, jalons = result_pv
 
-        sample_export_sap.to_excel(fichier_sap, index=False)
-        sample_pv.to_excel(fichier_pv, index=False)
-        sample_va.to_excel(fichier_va, index=False)
+    # 4. Lire et calculer l'EV
+    df_va = lire_valeur_acquise(str(sample_va_xlsx))
+    assert df_va is not None
+    ev = calculer_earned_value(df_pv, df_va)
 
-        # Workflow complet
-        # 1. Lire l'export SAP
-        df_sap = lire_export_sap(str(fichier_sap))
-        assert df_sap is not None
+    return {"ac": ac, "df_pv": df_pv, "pv": pv, "jalons": jalons, "ev": ev}
 
-        # 2. Calculer les dépenses cumulées
-        ac = calculer_depenses_cumulees(df_sap, "Date de la pièce", "Val./Devise objet")
-        assert ac is not None
-        assert len(ac) > 0
-
-        # 3. Lire et traiter la PV
-        df_pv = lire_planned_value(str(fichier_pv))
-        assert df_pv is not None
 
-        result_pv = traiter_planned_value(df_pv)
-        assert result_pv is not None
-        pv, jalons = result_pv
-        assert pv is not None
-        assert jalons is not None
-
-        # 4. Lire et calculer l'EV
-        df_va = lire_valeur_acquise(str(fichier_va))
-        assert df_va is not None
+class TestWorkflowComplet:
+    """Tests d'intégration pour le workflow complet"""
 
-        ev = calculer_earned_value(df_pv, df_va)
-        assert ev is not None
+    def test_workflow_avec_tous_fichiers(self, workflow_results):
+        """Test du workflow complet avec tous les fichiers"""
+        ac, pv, ev = workflow_results["ac"], workflow_results["pv"], workflow_results["ev"]
+        assert len(ac) > 0
+        assert workflow_results["jalons"] is not None
         assert len(ev) > 0
 
         # 5. Calculer les projections
-        projections = calculer_projections_automatiques(ac, ev, pv, df_pv)
+        projections = calculer_projections_automatiques(ac, ev, pv, workflow_results["df_pv"])
         assert projections is not None
 
         projections_data, _, _ = projections
         assert len(projections_data) == 3  # CPI, CPI_SPI, RESTE_PLAN
         assert all(k in projections_data for k in ["CPI", "CPI_SPI", "RESTE_PLAN"])
 
-    def test_workflow_minimal_sans_forecast(self, tmp_path, sample_export_sap, sample_pv, sample_va):
-        """Test du workflow minimal sans fichier forecast"""
-
-        # Créer les fichiers temporaires
-        fichier_sap = tmp_path / "export.xlsx"
+    def test_jalons_numeriques_pv_va(self, tmp_path):
+        """Test qu'un jalon numérique de pv.xlsx correspond au même jalon numérique de va.xlsx"""
         fichier_pv = tmp_path / "pv.xlsx"
         fichier_va = tmp_path / "va.xlsx"
+        ecrire_xlsx(
+            pd.DataFrame(
+                {
+                    "Jalon": [1, 2],
+                    "Date": pd.to_datetime(["2025-01-31", "2025-02-28"]),
+                    "Montant planifié": [100000, 200000],
+                }
+            ),
+            fichier_pv,
+        )
+        ecrire_xlsx(
+            pd.DataFrame(
+                {
+                    "Jalon": [1, 2],
+                    datetime(2025, 1, 1): [0.5, 0.0],
+                    datetime(2025, 2, 1): [1.0, 0.5],
+                }
+            ),
+            fichier_va,
+        )
+
+        ev = calculer_earned_value(lire_planned_value(str(fichier_pv)), lire_valeur_acquise(str(fichier_va)))
 
-        sample_export_sap.to_excel(fichier_sap, index=False)
-        sample_pv.to_excel(fichier_pv, index=False)
-        sample_va.to_excel(fichier_va, index=False)
-
-        # Workflow sans forecast
-        df_sap = lire_export_sap(str(fichier_sap))
-        ac = calculer_depenses_cumulees(df_sap, "Date de la pièce", "Val./Devise objet")
-
-        df_pv = lire_planned_value(str(fichier_pv))
-        result_pv = traiter_planned_value(df_pv)
-        assert result_pv is not None
-        pv, _ = result_pv
+        assert ev is not None
+        assert ev.iloc[-1] == 200000  # 100 % de 100k + 50 % de 200k
 
-        df_va = lire_valeur_acquise(str(fichier_va))
-        ev = calculer_earned_value(df_pv, df_va)
+    def test_workflow_minimal_sans_forecast(self, workflow_results):
+        """Test du workflow minimal sans fichier forecast"""
+        ac, pv, ev = workflow_results["ac"], workflow_results["pv"], workflow_results["ev"]
 
         # Toutes les étapes doivent réussir
         assert ac is not None
@@ -2,15 +2,11 @@
 Tests pour les calculs de projections EAC
 """
 
-import sys
-from datetime import datetime
-from pathlib import Path
-
 import pandas as pd
 import pytest
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
 from analyse import calculer_eac_projete, calculer_projections_automatiques
+from tests.utils import index_mensuel
 
 
 class TestProjectionsAutomatiques:
@@ -19,18 +15,18 @@ class TestProjectionsAutomatiques:
     def test_projections_avec_bonnes_performances(self):
         """Test avec CPI et SPI > 1 (bonnes performances)"""
         # AC: 100k dépensés
-        depenses = pd.Series([50000, 100000], index=pd.period_range("2025-01", periods=2, freq="M"))
+        depenses = pd.Series([50000, 100000], index=index_mensuel(2))
 
         # EV: 120k de valeur acquise (bon rendement)
-        ev = pd.Series([60000, 120000], index=pd.period_range("2025-01", periods=2, freq="M"))
+        ev = pd.Series([60000, 120000], index=index_mensuel(2))
 
         # PV: 110k prévu, BAC = 200k
-        pv = pd.Series([55000, 110000, 150000, 200000], index=pd.period_range("2025-01", periods=4, freq="M"))
+        pv = pd.Series([55000, 110000, 150000, 200000], index=index_mensuel(4))
 
         df_pv = pd.DataFrame(
             {
                 "Jalon": ["J1", "J2"],
-                "Date": [datetime(2025, 3, 31), datetime(2025, 4, 30)],
+                "Date": pd.to_datetime(["2025-03-31", "2025-04-30"]),
                 "Montant planifié": [150000, 50000],
                 "Cumul planifié": [150000, 200000],
             }
@@ -55,18 +51,18 @@ class TestProjectionsAutomatiques:
     def test_projections_avec_mauvaises_performances(self):
         """Test avec CPI et SPI < 1 (mauvaises performances)"""
         # AC: 200k dépensés
-        depenses = pd.Series([100000, 200000], index=pd.period_range("2025-01", periods=2, freq="M"))
+        depenses = pd.Series([100000, 200000], index=index_mensuel(2))
 
         # EV: 100k de valeur acquise (mauvais rendement)
-        ev = pd.Series([50000, 100000], index=pd.period_range("2025-01", periods=2, freq="M"))
+        ev = pd.Series([50000, 100000], index=index_mensuel(2))
 
         # PV: 150k prévu, BAC = 300k
-        pv = pd.Series([75000, 150000, 225000, 300000], index=pd.period_range("2025-01", periods=4, freq="M"))
+        pv = pd.Series([75000, 150000, 225000, 300000], index=index_mensuel(4))
 
         df_pv = pd.DataFrame(
             {
                 "Jalon": ["J1", "J2"],
-                "Date": [datetime(2025, 3, 31), datetime(2025, 4, 30)],
+                "Date": pd.to_datetime(["2025-03-31", "2025-04-30"]),
                 "Montant planifié": [225000, 75000],
                 "Cumul planifié": [225000, 300000],
             }
@@ -88,14 +84,19 @@ class TestProjectionsAutomatiques:
 
     def test_projections_series_temporelles(self):
         """Test que les séries temporelles sont générées"""
-        depenses = pd.Series([100000], index=pd.period_range("2025-01", periods=1, freq="M"))
+        depenses = pd.Series([100000], index=index_mensuel(1))
 
-        ev = pd.Series([50000], index=pd.period_range("2025-01", periods=1, freq="M"))
+        ev = pd.Series([50000], index=index_mensuel(1))
 
-        pv = pd.Series([100000, 200000], index=pd.period_range("2025-01", periods=2, freq="M"))
+        pv = pd.Series([100000, 200000], index=index_mensuel(2))
 
         df_pv = pd.DataFrame(
-            {"Jalon": ["J1"], "Date": [datetime(2025, 2, 28)], "Montant planifié": [200000], "Cumul planifié": [200000]}
+            {
+                "Jalon": ["J1"],
+                "Date": pd.to_datetime(["2025-02-28"]),
+                "Montant planifié": [200000],
+                "Cumul planifié": [200000],
+            }
         )
 
         result = calculer_projections_automatiques(depenses, ev, pv, df_pv)
@@ -114,9 +115,9 @@ class TestProjectionsAutomatiques:
 
     def test_projections_sans_ev(self):
         """Test sans Earned Value"""
-        depenses = pd.Series([100000], index=pd.period_range("2025-01", periods=1, freq="M"))
-        pv = pd.Series([100000], index=pd.period_range("2025-01", periods=1, freq="M"))
-        df_pv = pd.DataFrame({"Jalon": ["J1"], "Date": [datetime(2025, 2, 28)]})
+        depenses = pd.Series([100000], index=index_mensuel(1))
+        pv = pd.Series([100000], index=index_mensuel(1))
+        df_pv = pd.DataFrame({"Jalon": ["J1"], "Date": pd.to_datetime(["2025-02-28"])})
 
         result = calculer_projections_automatiques(depenses, None, pv, df_pv)
         assert result is None
@@ -127,12 +128,12 @@ class TestCalculEACProjete:
 
     def test_eac_projete_simple(self):
         """Test avec un fichier forecast simple"""
-        ev = pd.Series([50000, 100000], index=pd.period_range("2025-01", periods=2, freq="M"))
+        ev = pd.Series([50000, 100000], index=index_mensuel(2))
 
         df_forecast = pd.DataFrame(
             {
                 "Jalon": ["J3", "J4"],
-                "Date projetée": [datetime(2026, 7, 31), datetime(2026, 10, 31)],
+                "Date projetée": pd.to_datetime(["2026-07-31", "2026-10-31"]),
                 "EAC (€)": [420000, 230000],
             }
         )
@@ -140,7 +141,7 @@ class TestCalculEACProjete:
         df_pv = pd.DataFrame(
             {
                 "Jalon": ["J1", "J2", "J3", "J4"],
-                "Date": [datetime(2025, 3, 31), datetime(2025, 6, 30), datetime(2026, 7, 31), datetime(2026, 10, 31)],
+                "Date": pd.to_datetime(["2025-03-31", "2025-06-30", "2026-07-31", "2026-10-31"]),
                 "Montant planifié": [100000, 200000, 300000, 150000],
             }
         )
@@ -159,8 +160,8 @@ class TestCalculEACProjete:
 
     def test_eac_projete_sans_forecast(self):
         """Test sans fichier forecast"""
-        ev = pd.Series([100000], index=pd.period_range("2025-01", periods=1, freq="M"))
-        df_pv = pd.DataFrame({"Jalon": ["J1"], "Date": [datetime(2025, 3, 31)]})
+        ev = pd.Series([100000], index=index_mensuel(1))
+        df_pv = pd.DataFrame({"Jalon": ["J1"], "Date": pd.to_datetime(["2025-03-31"])})
 
         result = calculer_eac_projete(ev, None, df_pv)
         assert result is None
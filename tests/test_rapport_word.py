@@ -3,169 +3,261 @@ Tests pour la génération de rapports Word
 """
 
 import struct
-import sys
+import zlib
 from datetime import datetime
 from pathlib import Path
 
 import pandas as pd
+import pytest
+from docx import Document
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
 from analyse import generer_rapport_word
+from tests.utils import index_mensuel
+
+
+def _chunk_png(type_chunk: bytes, donnees: bytes) -> bytes:
+    """Chunk PNG : longueur, type, données puis CRC32 calculé sur le type et les données"""
+    return struct.pack(">I", len(donnees)) + type_chunk + donnees + struct.pack(">I", zlib.crc32(type_chunk + donnees))
+
+
+# PNG 1x1 transparent : une ligne = octet de filtre (aucun) puis un pixel RGBA
+_PNG_1X1 = (
+    b"\x89PNG\r\n\x1a\n"
+    + _chunk_png(b"IHDR", struct.pack(">2I5B", 1, 1, 8, 6, 0, 0, 0))
+    + _chunk_png(b"IDAT", zlib.compress(b"\x00" * 5))
+    + _chunk_png(b"IEND", b"")
+)
+
+
+@pytest.fixture(scope="session")
+def minimal_png_path(tmp_path_factory) -> str:
+    """Fixture pour un graphique PNG minimal, écrit une seule fois (le rapport ne fait que le lire)"""
+    fichier = tmp_path_factory.mktemp("png") / "graphique.png"
+    fichier.write_bytes(_PNG_1X1)
+    return str(fichier)
+
+
+def _scenarios_ecarts(fichier_word: Path) -> list[str]:
+    """Scénarios listés dans la section « Écarts par rapport au budget » du rapport"""
+    paragraphes = [p.text for p in Document(str(fichier_word)).paragraphs]
+    debut = paragraphes.index("Écarts par rapport au budget:") + 1
+    scenarios = []
+    for texte in paragraphes[debut:]:
+        if not texte.startswith("  • "):
+            break
+        scenarios.append(texte.removeprefix("  • ").split(":")[0])
+    return scenarios
+
+
+@pytest.fixture(scope="class")
+def rapport_complet(tmp_path_factory, minimal_png_path) -> Path:
+    """Fixture pour un rapport Word complet (toutes les projections), généré une seule fois par classe"""
+    fichier_word = tmp_path_factory.mktemp("rapport") / "rapport.docx"
+    index = index_mensuel(3)
+
+    df_tableau = pd.DataFrame(
+        {
+            "Mois": ["2025-01", "2025-02", "2025-03"],
+            "AC (Dépenses réelles)": [10000, 25000, 45000],
+            "PV (Budget prévu)": [12000, 24000, 48000],
+            "EV (Valeur acquise)": [11000, 23000, 46000],
+        }
+    )
+    depenses = pd.Series([10000, 25000, 45000], index=index)
+    pv = pd.Series([12000, 24000, 48000], index=index)
+    ev = pd.Series([11000, 23000, 46000], index=index)
+
+    projections = {
+        "cpi": {
+            "series": pd.Series([48000], index=index_mensuel(1, "2025-04")),
+            "eac": 48000,
+            "date": datetime(2025, 4, 30),
+        },
+        "cpi_spi": {
+            "series": pd.Series([50000], index=index_mensuel(1, "2025-04")),
+            "eac": 50000,
+            "date": datetime(2025, 4, 30),
+        },
+        "reste_plan": {
+            "series": pd.Series([45000], index=index_mensuel(1, "2025-04")),
+            "eac": 45000,
+            "date": datetime(2025, 4, 30),
+        },
+        "forecast": {
+            "series": pd.Series([52000], index=index_mensuel(1, "2025-04")),
+            "eac": 52000,
+            "date": datetime(2025, 4, 30),
+        },
+    }
+
+    generer_rapport_word(
+        str(fichier_word),
+        df_tableau,
+        minimal_png_path,
+        depenses,
+        pv,
+        ev,
+        projections,
+        minimal_png_path,
+    )
+    return fichier_word
 
 
 class TestGenerationRapportWord:
     """Tests pour la génération de rapports Word"""
 
-    def test_generer_rapport_word_complet(self, tmp_path):
+    def test_generer_rapport_word_complet(self, rapport_complet):
         """Test de génération d'un rapport Word complet"""
-        fichier_word = tmp_path / "rapport.docx"
-        fichier_graphique = tmp_path / "graphique_realise.png"
-        fichier_projections = tmp_path / "graphique_projections.png"
-
-        # Créer des fichiers graphiques PNG valides (1x1 pixel)
-        def create_minimal_png(path):
-            # Créer un PNG minimal 1x1 transparent
-            png_header = b"\x89PNG\r\n\x1a\n"
-            ihdr = b"IHDR" + struct.pack(">2I5B", 1, 1, 8, 6, 0, 0, 0)
-            ihdr_crc = struct.pack(">I", 0xD951E134)  # CRC pré-calculé
-            idat = b"IDAT" + b"\x08\x1d\x01\x05\x00\xfa\xff\x00\x00\x00\x00\x01"
-            idat_crc = struct.pack(">I", 0xDE09EC4C)  # CRC pré-calculé
-            iend = b"IEND" + struct.pack(">I", 0xAE426082)  # CRC pré-calculé
-
-            png_data = png_header
-            png_data += struct.pack(">I", 13) + ihdr + ihdr_crc
-            png_data += struct.pack(">I", 12) + idat + idat_crc
-            png_data += struct.pack(">I", 0) + iend
-
-            path.write_bytes(png_data)
-
-        create_minimal_png(fichier_graphique)
-        create_minimal_png(fichier_projections)
-
-        # Données de test
+        assert rapport_complet.exists()
+
+    def test_generer_rapport_word_avec_toutes_projections(self, rapport_complet):
+        """Test avec toutes les méthodes de projection"""
+        assert _scenarios_ecarts(rapport_complet) == ["Optimiste", "Réaliste", "Pessimiste", "Forecast"]
+
+    def test_generer_rapport_word_projections_partielles(self, tmp_path, minimal_png_path):
+        """Test avec les seules projections CPI et CPI×SPI : les scénarios absents ne sont pas listés"""
+        fichier_word = tmp_path / "rapport_partiel.docx"
+
         df_tableau = pd.DataFrame(
             {
-                "Mois": ["2025-01", "2025-02", "2025-03"],
-                "AC (Dépenses réelles)": [10000, 25000, 45000],
-                "PV (Budget prévu)": [12000, 24000, 48000],
-                "EV (Valeur acquise)": [11000, 23000, 46000],
+                "Mois": ["2025-01"],
+                "AC (Dépenses réelles)": [10000],
+                "PV (Budget prévu)": [12000],
+                "EV (Valeur acquise)": [11000],
             }
         )
 
-        depenses = pd.Series(
-            [10000, 25000, 45000],
-            index=pd.period_range(start="2025-01", periods=3, freq="M"),
-        )
-
-        pv = pd.Series(
-            [12000, 24000, 48000],
-            index=pd.period_range(start="2025-01", periods=3, freq="M"),
-        )
-
-        ev = pd.Series(
-            [11000, 23000, 46000],
-            index=pd.period_range(start="2025-01", periods=3, freq="M"),
-        )
+        depenses = pd.Series([10000], index=index_mensuel(1))
+        pv = pd.Series([12000], index=index_mensuel(1))
+        ev = pd.Series([11000], index=index_mensuel(1))
 
         projections = {
             "cpi": {
-                "series": pd.Series([48000], index=pd.period_range(start="2025-04", periods=1, freq="M")),
+                "series": pd.Series([48000], index=index_mensuel(1, "2025-04")),
                 "eac": 48000,
                 "date": datetime(2025, 4, 30),
             },
             "cpi_spi": {
-                "series": pd.Series([50000], index=pd.period_range(start="2025-04", periods=1, freq="M")),
+                "series": pd.Series([50000], index=index_mensuel(1, "2025-04")),
                 "eac": 50000,
                 "date": datetime(2025, 4, 30),
             },
         }
 
-        # Générer le rapport
         generer_rapport_word(
             str(fichier_word),
             df_tableau,
-            str(fichier_graphique),
+            minimal_png_path,
             depenses,
             pv,
             ev,
             projections,
-            str(fichier_projections),
+            minimal_png_path,
         )
 
-        # Vérifier que le fichier a été créé
-        assert fichier_word.exists()
+        assert _scenarios_ecarts(fichier_word) == ["Réaliste", "Pessimiste"]
 
-    def test_generer_rapport_word_avec_toutes_projections(self, tmp_path):
-        """Test avec toutes les méthodes de projection"""
-        fichier_word = tmp_path / "rapport_projections.docx"
-        fichier_graphique = tmp_path / "graphique_realise.png"
-        fichier_projections = tmp_path / "graphique_projections.png"
-
-        # Créer des fichiers graphiques PNG valides (1x1 pixel)
-        def create_minimal_png(path):
-            # Créer un PNG minimal 1x1 transparent
-            png_header = b"\x89PNG\r\n\x1a\n"
-            ihdr = b"IHDR" + struct.pack(">2I5B", 1, 1, 8, 6, 0, 0, 0)
-            ihdr_crc = struct.pack(">I", 0xD951E134)  # CRC pré-calculé
-            idat = b"IDAT" + b"\x08\x1d\x01\x05\x00\xfa\xff\x00\x00\x00\x00\x01"
-            idat_crc = struct.pack(">I", 0xDE09EC4C)  # CRC pré-calculé
-            iend = b"IEND" + struct.pack(">I", 0xAE426082)  # CRC pré-calculé
-
-            png_data = png_header
-            png_data += struct.pack(">I", 13) + ihdr + ihdr_crc
-            png_data += struct.pack(">I", 12) + idat + idat_crc
-            png_data += struct.pack(">I", 0) + iend
-
-            path.write_bytes(png_data)
-
-        create_minimal_png(fichier_graphique)
-        create_minimal_png(fichier_projections)
+    def test_tableau_valeurs_formate_colonnes_numeriques(self, tmp_path):
+        """Test du formatage des cellules selon le type de chaque colonne"""
+        fichier_word = tmp_path / "rapport_tableau.docx"
+        index = index_mensuel(2)
 
         df_tableau = pd.DataFrame(
             {
-                "Mois": ["2025-01"],
-                "AC (Dépenses réelles)": [10000],
-                "PV (Budget prévu)": [12000],
-                "EV (Valeur acquise)": [11000],
+                "Mois": ["2025-01", "2025-02"],
+                "AC (Dépenses réelles)": [10000, 25000.5],
+                "PV (Budget prévu)": [12000, 0],
+                "Commentaire": ["1000", "n/a"],
+            }
+        )
+        depenses = pd.Series([10000, 25000.5], index=index)
+        pv = pd.Series([12000, 24000], index=index)
+
+        generer_rapport_word(
+            str(fichier_word),
+            df_tableau,
+            str(tmp_path / "absent.png"),
+            depenses,
+            pv,
+            None,
+            {},
+            str(tmp_path / "absent.png"),
+        )
+
+        table = Document(str(fichier_word)).tables[0]
+        lignes = [[cell.text for cell in row.cells] for row in table.rows]
+        assert lignes[0] == list(df_tableau.columns)
+        assert all(run.bold for cell in table.rows[0].cells for run in cell.paragraphs[0].runs)
+        # Colonnes numériques au format monétaire, colonnes texte inchangées
+        assert lignes[1] == ["2025-01", "10,000.00", "12,000.00", "1000"]
+        assert lignes[2] == ["2025-02", "25,000.50", "0.00", "n/a"]
+
+    def test_tableau_valeurs_exclut_mois_sans_valeur(self, tmp_path):
+        """Test de l'exclusion des mois où AC, PV et EV sont tous nuls"""
+        fichier_word = tmp_path / "rapport_filtre.docx"
+        index = index_mensuel(2)
+
+        df_tableau = pd.DataFrame(
+            {
+                "Mois": ["2025-01", "2025-02", "2025-03", "2025-04"],
+                "AC (Dépenses réelles)": [0.0, 10000.0, 0.0, 0.0],
+                "PV (Budget prévu)": [5000.0, 12000.0, 0.0, 0.0],
+                "EV (Valeur acquise)": [0.0, 9000.0, 7000.0, 0.0],
             }
         )
+        depenses = pd.Series([0.0, 10000.0], index=index)
+        pv = pd.Series([5000.0, 12000.0], index=index)
+
+        generer_rapport_word(
+            str(fichier_word),
+            df_tableau,
+            str(tmp_path / "absent.png"),
+            depenses,
+            pv,
+            None,
+            {},
+            str(tmp_path / "absent.png"),
+        )
+
+        table = Document(str(fichier_word)).tables[0]
+        mois = [row.cells[0].text for row in table.rows[1:]]
+        assert mois == ["2025-01", "2025-02", "2025-03"]
 
-        depenses = pd.Series([10000], index=pd.period_range(start="2025-01", periods=1, freq="M"))
-        pv = pd.Series([12000], index=pd.period_range(start="2025-01", periods=1, freq="M"))
-        ev = pd.Series([11000], index=pd.period_range(start="2025-01", periods=1, freq="M"))
+    def test_ecarts_scenarios_ordonnes_et_colores(self, tmp_path):
+        """Test de l'ordre et de la couleur des écarts par scénario"""
+        fichier_word = tmp_path / "rapport_ecarts.docx"
+        index = index_mensuel(1)
+        index_projection = index_mensuel(1, "2025-04")
 
+        df_tableau = pd.DataFrame({"Mois": ["2025-01"], "AC (Dépenses réelles)": [10000.0]})
+        depenses = pd.Series([10000.0], index=index)
+        pv = pd.Series([100000.0], index=index)
+
+        # Ordre d'insertion volontairement différent de l'ordre d'affichage
         projections = {
-            "cpi": {
-                "series": pd.Series([48000], index=pd.period_range(start="2025-04", periods=1, freq="M")),
-                "eac": 48000,
-                "date": datetime(2025, 4, 30),
-            },
-            "cpi_spi": {
-                "series": pd.Series([50000], index=pd.period_range(start="2025-04", periods=1, freq="M")),
-                "eac": 50000,
-                "date": datetime(2025, 4, 30),
-            },
-            "reste_plan": {
-                "series": pd.Series([45000], index=pd.period_range(start="2025-04", periods=1, freq="M")),
-                "eac": 45000,
-                "date": datetime(2025, 4, 30),
-            },
-            "forecast": {
-                "series": pd.Series([52000], index=pd.period_range(start="2025-04", periods=1, freq="M")),
-                "eac": 52000,
-                "date": datetime(2025, 4, 30),
-            },
+            methode: {"series": pd.Series([eac], index=index_projection), "eac": eac, "date": None}
+            for methode, eac in [("forecast", 95000), ("cpi_spi", 130000), ("reste_plan", 90000), ("cpi", 110000)]
         }
 
         generer_rapport_word(
             str(fichier_word),
             df_tableau,
-            str(fichier_graphique),
+            str(tmp_path / "absent.png"),
             depenses,
             pv,
-            ev,
+            None,
             projections,
-            str(fichier_projections),
+            str(tmp_path / "absent.png"),
         )
 
-        assert fichier_word.exists()
+        paragraphes = Document(str(fichier_word)).paragraphs
+        debut = next(i for i, p in enumerate(paragraphes) if p.text == "Écarts par rapport au budget:")
+        ecarts = paragraphes[debut + 1 : debut + 5]
+        assert [p.text for p in ecarts] == [
+            "  • Optimiste: -10,000.00 € (-10.0%)",
+            "  • Réaliste: +10,000.00 € (+10.0%)",
+            "  • Pessimiste: +30,000.00 € (+30.0%)",
+            "  • Forecast: -5,000.00 € (-5.0%)",
+        ]
+        couleurs = [str(p.runs[0].font.color.rgb) for p in ecarts]
+        assert couleurs == ["E74C3C", "2ECC71", "2ECC71", "E74C3C"]
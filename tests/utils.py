@@ -0,0 +1,43 @@
+"""
+Utilitaires partagés par les tests (index mensuels, écriture de classeurs .xlsx)
+"""
+
+import io
+from collections.abc import Iterable
+from functools import cache
+from pathlib import Path
+from typing import IO
+
+import pandas as pd
+from openpyxl import Workbook
+
+
+@cache
+def index_mensuel(periodes: int, debut: str = "2025-01") -> pd.PeriodIndex:
+    """Index mensuel (PeriodIndex, comme dans le code de production), partagé entre les tests car immuable"""
+    return pd.period_range(debut, periods=periodes, freq="M")
+
+
+def ecrire_xlsx_lignes(fichier: Path | IO[bytes], colonnes: Iterable, lignes: Iterable[Iterable]) -> None:
+    """Écrit un en-tête et des lignes en .xlsx via le mode write-only d'openpyxl, sans passer par un DataFrame"""
+    classeur = Workbook(write_only=True)
+    feuille = classeur.create_sheet()
+    feuille.append(list(colonnes))
+    for ligne in lignes:
+        feuille.append(ligne)
+    classeur.save(fichier)
+
+
+def ecrire_xlsx(df: pd.DataFrame, fichier: Path | IO[bytes]) -> None:
+    """Écrit un DataFrame en .xlsx (sans index), ligne par ligne"""
+    # Cellules vides pour les NaN/NaT, comme DataFrame.to_excel
+    lignes = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+    ecrire_xlsx_lignes(fichier, df.columns, lignes)
+
+
+def xlsx_en_memoire(df: pd.DataFrame) -> io.BytesIO:
+    """Écrit un DataFrame en .xlsx dans un tampon mémoire, relu directement par les lecteurs (pd.read_excel)"""
+    tampon = io.BytesIO()
+    ecrire_xlsx(df, tampon)
+    tampon.seek(0)
+    return tampon